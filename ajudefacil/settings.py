@@ -31,8 +31,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'doacoes.middleware.InstrumentacaoConsultasMiddleware',
 ]
 
+INSTRUMENTACAO_ATIVA = os.environ.get('INSTRUMENTACAO_ATIVA', '').lower() in ('1', 'true', 'sim')
+INSTRUMENTACAO_LIMITE_CONSULTAS = (
+    int(os.environ['INSTRUMENTACAO_LIMITE_CONSULTAS'])
+    if os.environ.get('INSTRUMENTACAO_LIMITE_CONSULTAS') else None
+)
+
 ROOT_URLCONF = 'ajudefacil.urls'
 
 TEMPLATES = [
@@ -53,11 +60,109 @@ TEMPLATES = [
 WSGI_APPLICATION = 'ajudefacil.wsgi.application'
 
 
+# Reaproveitamento de conexões no PostgreSQL, escolhido por DB_POOL:
+#   persistente (padrão): uma conexão por thread, mantida por DB_CONN_MAX_AGE s;
+#   nativo: pool do psycopg 3 em cada processo, com DB_POOL_MIN/MAX conexões
+#       (preferível com SERVIDOR=asgi, em que cada requisição usa outra thread);
+#   externo: atrás de um pooler em modo transação (PgBouncer), sem cursores
+#       do lado do servidor.
+# Em todos os modos a conexão reaproveitada é testada antes do uso, evitando
+# erros depois de o banco derrubar conexões ociosas. Para comparar os modos,
+# suba um servidor com cada DB_POOL e rode
+#   python manage.py carga persistente=URL1 nativo=URL2 --concorrencia 1 10 50 100
+DB_POOL = os.environ.get('DB_POOL', 'persistente')
+
 DATABASES = {
-    'default': dj_database_url.config(default='sqlite:///db.sqlite3', conn_max_age=600)
+    'default': dj_database_url.config(
+        default='sqlite:///db.sqlite3',
+        conn_max_age=0 if DB_POOL == 'nativo' else int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
+    )
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    if DB_POOL == 'nativo':
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX', 10)),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+        }
+    elif DB_POOL == 'externo':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Perfil para instalações de um só nó em SQLite: WAL deixa leituras correrem
+# junto com uma escrita, e BEGIN IMMEDIATE faz a transação pegar o bloqueio de
+# escrita já no início, quando ainda dá para esperar o busy timeout, em vez de
+# falhar com "database is locked" ao tentar promover uma leitura. Desative com
+# SQLITE_PERFIL=0 (por exemplo para comparar com
+# python manage.py concorrencia_escrita).
+SQLITE_PRAGMAS = {}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' and os.environ.get('SQLITE_PERFIL', '1') != '0':
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': SQLITE_BUSY_TIMEOUT / 1000,
+    })
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': SQLITE_BUSY_TIMEOUT,
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),
+    }
+
+
+# O cache guarda a versão do estoque e os contadores do painel, que precisam
+# ser vistos por todos os workers: sem REDIS_URL, o padrão é um cache em
+# arquivos (CACHE_DIR), compartilhado pelos processos da mesma máquina. Um
+# cache local por processo deixaria os demais workers servindo estoque velho.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', os.path.join(BASE_DIR, '.cache')),
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 1000))},
+        }
+    }
+
+# Os testes usam um cache local próprio, sem tocar no CACHE_DIR.
+TEST_RUNNER = 'doacoes.tests.executor.ExecutorTestes'
+
+# Teto de validade das entradas, caso alguma invalidação se perca.
+CONTADORES_PAINEL_TIMEOUT = int(os.environ.get('CONTADORES_PAINEL_TIMEOUT', 300))
+CACHE_ESTOQUE_TIMEOUT = int(os.environ.get('CACHE_ESTOQUE_TIMEOUT', 300))
+
+# Entrega dos eventos de estoque (SSE). O padrão só alcança clientes ligados
+# ao mesmo processo, por isso gunicorn.conf.py sobe um só worker no modo asgi
+# com ele (e avisa se WEB_CONCURRENCY pedir mais); para vários workers,
+# aponte para outra implementação.
+EVENTOS_BROKER = os.environ.get('EVENTOS_BROKER', 'doacoes.utils.eventos.BrokerLocal')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'doacoes': {
+            'handlers': ['console'],
+            'level': os.environ.get('DOACOES_LOG_LEVEL', 'INFO'),
+        },
+    },
 }
 
 
+AUTHENTICATION_BACKENDS = ['doacoes.backends.PerfilBackend']
 
 
 AUTH_PASSWORD_VALIDATORS = [
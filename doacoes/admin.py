@@ -25,6 +25,7 @@ admin.site.register(User, CustomUserAdmin)
 @admin.register(Doacao)
 class DoacaoAdmin(admin.ModelAdmin):
     list_display = ('descricao', 'quantidade', 'categoria', 'status', 'doador')
+    list_select_related = ('categoria', 'doador')
     list_filter = ('categoria', 'status')
     search_fields = ('descricao', 'doador__username')
 
@@ -46,11 +47,13 @@ class LocalEntregaAdmin(admin.ModelAdmin):
 @admin.register(Distribuicao)
 class DistribuicaoAdmin(admin.ModelAdmin):
     list_display = ('doacao', 'recebedor', 'quantidade_distribuida', 'data_distribuicao')
+    list_select_related = ('doacao__categoria', 'recebedor')
     list_filter = ('data_distribuicao',)
     search_fields = ('doacao__descricao', 'recebedor__nome')
 
 @admin.register(Perfil)
 class PerfilAdmin(admin.ModelAdmin):
     list_display = ('usuario', 'tipo')
+    list_select_related = ('usuario',)
     list_filter = ('tipo',)
 
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class PerfilBackend(ModelBackend):
+    """
+    ModelBackend que carrega o Perfil junto com o usuário, no login e a cada
+    requisição, para que is_admin, user_is e as views que olham
+    request.user.perfil não façam uma consulta a mais. Como o perfil é lido
+    de novo em toda requisição, uma troca de tipo vale já na próxima.
+    """
+
+    def _usuarios(self):
+        return UserModel._default_manager.select_related('perfil')
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = self._usuarios().get(**{UserModel.USERNAME_FIELD: username})
+        except UserModel.DoesNotExist:
+            # Mesmo custo de hash de um usuário existente (ver ModelBackend).
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        try:
+            user = self._usuarios().get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        try:
+            user = await self._usuarios().aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -2,8 +2,9 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from .models import Recebedor, Perfil, LocalEntrega
-from validate_docbr import CPF, CNPJ # type: ignore
-import re
+from .utils.duplicados import recebedores_com_documento
+from .utils.importacao import formato_do_arquivo
+from .utils.validacao import limpar_cpf_cnpj, limpar_telefone
 
 class FormCadastroUsuario(UserCreationForm):
     tipo = forms.ChoiceField(
@@ -47,26 +48,10 @@ class FormCadastroUsuario(UserCreationForm):
             self.fields.pop('tipo')
 
     def clean_cpf_cnpj(self):
-        valor = self.cleaned_data.get('cpf_cnpj', '')
-        valor_numeros = re.sub(r'\D', '', valor)
-        cpf = CPF()
-        cnpj = CNPJ()
-        if len(valor_numeros) == 11:
-            if not cpf.validate(valor_numeros):
-                raise forms.ValidationError('CPF inválido.')
-        elif len(valor_numeros) == 14:
-            if not cnpj.validate(valor_numeros):
-                raise forms.ValidationError('CNPJ inválido.')
-        else:
-            raise forms.ValidationError('Informe um CPF (11 dígitos) ou CNPJ (14 dígitos) válido.')
-        return valor_numeros
+        return limpar_cpf_cnpj(self.cleaned_data.get('cpf_cnpj', ''))
 
     def clean_telefone(self):
-        valor = self.cleaned_data.get('telefone', '')
-        valor_numeros = re.sub(r'\D', '', valor)
-        if len(valor_numeros) not in [10, 11]:
-            raise forms.ValidationError('Telefone inválido. Informe com DDD (10 ou 11 dígitos).')
-        return valor_numeros
+        return limpar_telefone(self.cleaned_data.get('telefone', ''))
 
 class FormEditarUsuario(forms.ModelForm):
     endereco = forms.CharField(
@@ -83,11 +68,7 @@ class FormEditarUsuario(forms.ModelForm):
         fields = ['username', 'email']
 
     def clean_telefone(self):
-        valor = self.cleaned_data.get('telefone', '')
-        valor_numeros = re.sub(r'\D', '', valor)
-        if len(valor_numeros) not in [10, 11]:
-            raise forms.ValidationError('Telefone inválido. Informe com DDD (10 ou 11 dígitos).')
-        return valor_numeros
+        return limpar_telefone(self.cleaned_data.get('telefone', ''))
 
 class FormDoacoesMultiplas(forms.Form):
     local_entrega = forms.ModelChoiceField(
@@ -134,32 +115,22 @@ class FormRecebedor(forms.ModelForm):
         }
 
     def clean_cpf_cnpj(self):
-        valor = self.cleaned_data.get('cpf_cnpj', '')
-        valor_numeros = re.sub(r'\D', '', valor)
-        cpf = CPF()
-        cnpj = CNPJ()
-        if len(valor_numeros) == 11:
-            if not cpf.validate(valor_numeros):
-                raise forms.ValidationError('CPF inválido.')
-        elif len(valor_numeros) == 14:
-            if not cnpj.validate(valor_numeros):
-                raise forms.ValidationError('CNPJ inválido.')
-        else:
-            raise forms.ValidationError('Informe um CPF (11 dígitos) ou CNPJ (14 dígitos) válido.')
+        valor_numeros = limpar_cpf_cnpj(self.cleaned_data.get('cpf_cnpj', ''))
+        if recebedores_com_documento(valor_numeros, excluir_pk=self.instance.pk).exists():
+            raise forms.ValidationError('Já existe um recebedor cadastrado com este CPF/CNPJ.')
         return valor_numeros
 
     def clean_telefone(self):
-        valor = self.cleaned_data.get('telefone', '')
-        valor_numeros = re.sub(r'\D', '', valor)
-        if len(valor_numeros) not in [10, 11]:
-            raise forms.ValidationError('Telefone inválido. Informe com DDD (10 ou 11 dígitos).')
-        return valor_numeros
+        return limpar_telefone(self.cleaned_data.get('telefone', ''))
 
 class DistribuicaoMultiplaPorCategoriaForm(forms.Form):
+    # Escolhido pela busca em buscar_recebedores; só o id é enviado, então a
+    # página não lista os recebedores.
     recebedor = forms.ModelChoiceField(
         queryset=Recebedor.objects.all(),
         label='Recebedor',
-        required=True
+        required=True,
+        widget=forms.HiddenInput
     )
 
     def __init__(self, *args, categorias=None, **kwargs):
@@ -179,3 +150,20 @@ class FormLocalEntrega(forms.ModelForm):
         model = LocalEntrega
         fields = ['nome']
         widgets = {'nome': forms.TextInput(attrs={'class': 'form-control'})}
+
+class FormImportacao(forms.Form):
+    tipo = forms.ChoiceField(
+        label='Tipo de registro',
+        choices=[('recebedores', 'Recebedores'), ('doacoes', 'Doações'), ('usuarios', 'Usuários')],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    arquivo = forms.FileField(
+        label='Arquivo (CSV, JSON ou JSON Lines)',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control'})
+    )
+
+    def clean_arquivo(self):
+        arquivo = self.cleaned_data['arquivo']
+        if not formato_do_arquivo(arquivo.name):
+            raise forms.ValidationError('Envie um arquivo .csv, .json ou .jsonl.')
+        return arquivo
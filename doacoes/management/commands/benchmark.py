@@ -0,0 +1,140 @@
+import json
+import subprocess
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from doacoes.models import Recebedor, SaldoEstoque
+from doacoes.utils import contadores, estoque
+from doacoes.utils.distribuicao import distribuir
+
+ROTAS = [
+    ('admin_dashboard', 'administrador'),
+    ('admin_relatorio', 'administrador'),
+    ('admin_gerenciar_usuarios', 'administrador'),
+    ('admin_gerenciar_recebedores', 'administrador'),
+    ('home_voluntario', 'voluntario'),
+    ('listar_doacoes', 'voluntario'),
+    ('distribuir_por_categoria', 'voluntario'),
+    ('minhas_doacoes', 'doador'),
+    ('fazer_doacoes_multiplas', 'doador'),
+]
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[indice]
+
+
+def resumo(tempos, consultas):
+    return {
+        'p50_ms': round(percentil(tempos, 50) * 1000, 2),
+        'p95_ms': round(percentil(tempos, 95) * 1000, 2),
+        'consultas': max(consultas),
+    }
+
+
+def usuario_benchmark(tipo):
+    usuario, criado = User.objects.get_or_create(username=f"benchmark_{tipo}")
+    if criado or usuario.perfil.tipo != tipo:
+        usuario.perfil.tipo = tipo
+        usuario.perfil.save()
+    return usuario
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede p50/p95 de latência e número de consultas das principais views e da "
+        "alocação de distribuir_por_categoria, com o client de testes, e imprime JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=20)
+        parser.add_argument('--rotas', nargs='*', help="Limita a medição a estas rotas.")
+        parser.add_argument('--quantidade', type=int, default=50,
+                            help="Unidades distribuídas em cada medição da alocação.")
+        parser.add_argument('--saida', help="Grava o JSON neste arquivo além de imprimi-lo.")
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+        if repeticoes < 1:
+            raise CommandError("--repeticoes deve ser pelo menos 1.")
+
+        rotas = ROTAS
+        if options['rotas']:
+            rotas = [(nome, tipo) for nome, tipo in ROTAS if nome in options['rotas']]
+
+        resultado = {
+            'commit': self._commit(),
+            'banco': connection.vendor,
+            'repeticoes': repeticoes,
+            'rotas': {},
+        }
+
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for nome, tipo in rotas:
+                cliente = Client()
+                cliente.force_login(usuario_benchmark(tipo))
+                url = reverse(nome)
+                tempos, consultas = [], []
+                for _ in range(repeticoes):
+                    # Só as chaves do app: o cache pode ser um Redis compartilhado.
+                    cache.delete_many([contadores.CHAVE, estoque.CHAVE_VERSAO])
+                    with CaptureQueriesContext(connection) as capturadas:
+                        inicio = time.perf_counter()
+                        resposta = cliente.get(url)
+                        tempos.append(time.perf_counter() - inicio)
+                    if resposta.status_code >= 400:
+                        raise CommandError(f"{nome} respondeu HTTP {resposta.status_code}.")
+                    consultas.append(len(capturadas))
+                resultado['rotas'][nome] = resumo(tempos, consultas)
+
+        resultado['alocacao'] = self._medir_alocacao(repeticoes, options['quantidade'])
+
+        saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(saida)
+        self.stdout.write(saida)
+
+    def _medir_alocacao(self, repeticoes, quantidade):
+        recebedor = Recebedor.objects.first()
+        saldo = (
+            SaldoEstoque.objects
+            .values('categoria_id')
+            .annotate(total=Sum('quantidade'))
+            .order_by('-total')
+            .first()
+        )
+        if not recebedor or not saldo or not saldo['total']:
+            return None
+
+        pedido = {saldo['categoria_id']: min(quantidade, saldo['total'])}
+        tempos, consultas, linhas = [], [], 0
+        for _ in range(repeticoes):
+            # Cada medição é desfeita para não consumir o estoque.
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as capturadas:
+                    inicio = time.perf_counter()
+                    linhas = len(distribuir(recebedor, pedido))
+                    tempos.append(time.perf_counter() - inicio)
+                consultas.append(len(capturadas))
+                transaction.set_rollback(True)
+        return {**resumo(tempos, consultas), 'unidades': pedido[saldo['categoria_id']], 'doacoes_consumidas': linhas}
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,116 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from .benchmark import percentil, usuario_benchmark
+
+ROTAS = [
+    ('listar_doacoes', 'voluntario'),
+    ('minhas_doacoes', 'doador'),
+    ('admin_dashboard', 'administrador'),
+    ('admin_relatorio', 'administrador'),
+]
+
+
+def sessao(tipo):
+    """Cookie de sessão de um usuário de benchmark, gravado no banco configurado."""
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        cliente = Client()
+        cliente.force_login(usuario_benchmark(tipo))
+    return cliente.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def requisitar(url, cookie, timeout, host=None):
+    cabecalhos = {'Cookie': f"{settings.SESSION_COOKIE_NAME}={cookie}"}
+    if host:
+        cabecalhos['Host'] = host
+    pedido = urllib.request.Request(url, headers=cabecalhos)
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(pedido, timeout=timeout) as resposta:
+            resposta.read()
+            status = resposta.status
+    except urllib.error.HTTPError as erro:
+        status = erro.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    return time.perf_counter() - inicio, status
+
+
+class Command(BaseCommand):
+    help = (
+        "Dispara requisições concorrentes contra servidores já em execução "
+        "(por exemplo o mesmo app em modo WSGI e em modo ASGI) e imprime, por "
+        "servidor, rota e nível de concorrência, vazão, p50/p95 e erros em JSON. "
+        "Usa o banco configurado para criar as sessões, então precisa apontar para "
+        "o mesmo banco dos servidores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('servidores', nargs='+',
+                            help="URLs base, ex.: wsgi=http://127.0.0.1:8000 asgi=http://127.0.0.1:8001")
+        parser.add_argument('--concorrencia', type=int, nargs='+', default=[50],
+                            help="Um ou mais níveis de clientes simultâneos, ex.: 1 10 50 100.")
+        parser.add_argument('--requisicoes', type=int, default=500, help="Requisições por rota.")
+        parser.add_argument('--rotas', nargs='*', help="Limita a medição a estas rotas.")
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--host', help="Cabeçalho Host enviado, se o endereço não estiver em ALLOWED_HOSTS.")
+        parser.add_argument('--saida', help="Grava o JSON neste arquivo além de imprimi-lo.")
+
+    def handle(self, *args, **options):
+        if min(options['concorrencia']) < 1 or options['requisicoes'] < 1:
+            raise CommandError("--concorrencia e --requisicoes devem ser pelo menos 1.")
+
+        rotas = ROTAS
+        if options['rotas']:
+            rotas = [(nome, tipo) for nome, tipo in ROTAS if nome in options['rotas']]
+        cookies = {tipo: sessao(tipo) for tipo in {tipo for _, tipo in rotas}}
+
+        resultado = {
+            'concorrencia': options['concorrencia'],
+            'requisicoes': options['requisicoes'],
+            'servidores': {},
+        }
+        for servidor in options['servidores']:
+            rotulo, _, base = servidor.rpartition('=')
+            base = base.rstrip('/')
+            resultado['servidores'][rotulo or base] = {
+                nome: {
+                    str(nivel): self._medir(base + reverse(nome), cookies[tipo], nivel, options)
+                    for nivel in options['concorrencia']
+                }
+                for nome, tipo in rotas
+            }
+
+        saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(saida)
+        self.stdout.write(saida)
+
+    def _medir(self, url, cookie, concorrencia, options):
+        total = options['requisicoes']
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            inicio = time.perf_counter()
+            medidas = list(executor.map(
+                lambda _: requisitar(url, cookie, options['timeout'], options['host']), range(total)
+            ))
+            duracao = time.perf_counter() - inicio
+
+        tempos = [t for t, status in medidas if status == 200]
+        erros = total - len(tempos)
+        if not tempos:
+            return {'erros': erros}
+        return {
+            'req_por_s': round(len(tempos) / duracao, 1),
+            'p50_ms': round(percentil(tempos, 50) * 1000, 2),
+            'p95_ms': round(percentil(tempos, 95) * 1000, 2),
+            'erros': erros,
+        }
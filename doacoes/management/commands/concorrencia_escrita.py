@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from doacoes.models import Categoria, LocalEntrega, Recebedor
+from doacoes.utils.distribuicao import distribuir
+from doacoes.utils.recebimento import registrar_doacoes
+
+from .benchmark import percentil
+
+
+class Command(BaseCommand):
+    help = (
+        "Várias threads distribuem ao mesmo tempo, cada uma com a sua conexão, "
+        "como voluntários simultâneos em distribuir_por_categoria, e imprime em "
+        "JSON vazão, latência e quantas operações falharam (ex.: 'database is "
+        "locked'). Grava no banco configurado e apaga ao final a categoria e o "
+        "local criados para o teste; use uma cópia do banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--operacoes', type=int, default=50, help="Distribuições por thread.")
+        parser.add_argument('--doacoes', type=int, default=20,
+                            help="Doações pendentes semeadas, consumidas em ordem FIFO.")
+
+    def handle(self, *args, **options):
+        threads, operacoes = options['threads'], options['operacoes']
+        if threads < 1 or operacoes < 1 or options['doacoes'] < 1:
+            raise CommandError("--threads, --operacoes e --doacoes devem ser pelo menos 1.")
+
+        doador, _ = User.objects.get_or_create(username='benchmark_doador')
+        recebedor = Recebedor.objects.create(nome='benchmark escrita', cpf_cnpj='0', endereco='-')
+        categoria = Categoria.objects.create(nome=f"benchmark escrita {time.time_ns()}")
+        local = LocalEntrega.objects.create(nome='benchmark escrita')
+
+        # Estoque suficiente para todas as operações, espalhado em várias doações.
+        unidades = -(-threads * operacoes // options['doacoes'])
+        for _ in range(options['doacoes']):
+            registrar_doacoes(doador, local, {categoria: unidades})
+
+        tempos, erros = [], []
+        trava = threading.Lock()
+        largada = threading.Barrier(threads)
+
+        def trabalhar():
+            try:
+                largada.wait()
+                for _ in range(operacoes):
+                    inicio = time.perf_counter()
+                    try:
+                        distribuir(recebedor, {categoria.id: 1})
+                    except OperationalError as erro:
+                        with trava:
+                            erros.append(str(erro))
+                    else:
+                        with trava:
+                            tempos.append(time.perf_counter() - inicio)
+            finally:
+                connections.close_all()
+
+        try:
+            inicio = time.perf_counter()
+            trabalhadores = [threading.Thread(target=trabalhar) for _ in range(threads)]
+            for t in trabalhadores:
+                t.start()
+            for t in trabalhadores:
+                t.join()
+            duracao = time.perf_counter() - inicio
+        finally:
+            categoria.delete()
+            local.delete()
+            recebedor.delete()
+
+        resultado = {
+            'banco': connection.vendor,
+            'threads': threads,
+            'operacoes': threads * operacoes,
+            'concluidas': len(tempos),
+            'falhas': len(erros),
+            'erros': sorted(set(erros)),
+            'ops_por_s': round(len(tempos) / duracao, 1),
+        }
+        if tempos:
+            resultado['p50_ms'] = round(percentil(tempos, 50) * 1000, 2)
+            resultado['p95_ms'] = round(percentil(tempos, 95) * 1000, 2)
+        self.stdout.write(json.dumps(resultado, indent=2, ensure_ascii=False))
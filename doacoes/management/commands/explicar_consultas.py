@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from doacoes.models import Categoria, Doacao, LocalEntrega
+from doacoes.utils import relatorio
+from doacoes.utils.distribuicao import consulta_bloqueio
+
+
+def consultas():
+    categoria = Categoria.objects.order_by('id').first()
+    local = LocalEntrega.objects.order_by('id').first()
+    cid = categoria.id if categoria else 0
+    lid = local.id if local else 0
+
+    return {
+        'home_voluntario': (
+            Doacao.objects.filter(status='pendente').order_by('data_criacao')
+        ),
+        # O prefixo FIFO (_necessarias) que o alocador bloqueia para um
+        # pedido de uma unidade.
+        'distribuir_por_categoria': consulta_bloqueio({cid: 1}),
+        'relatorio': relatorio.consulta_pagina(None, *relatorio.filtros({})),
+        'relatorio_categoria_local': relatorio.consulta_pagina(
+            None, *relatorio.filtros({'categoria': cid, 'local_entrega': lid})
+        ),
+        'relatorio_pendentes_total': (
+            Doacao.objects.filter(status='pendente', local_entrega_id=lid)
+            .values('status').annotate(total=Sum('quantidade'))
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = "Mostra o plano de execução (EXPLAIN) das consultas das filas e do relatório."
+
+    def add_arguments(self, parser):
+        parser.add_argument('consultas', nargs='*', help="Nomes das consultas; todas por padrão.")
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help="Executa as consultas (EXPLAIN ANALYZE); disponível apenas no PostgreSQL."
+        )
+
+    def handle(self, *args, **options):
+        disponiveis = consultas()
+        nomes = options['consultas'] or list(disponiveis)
+        desconhecidas = set(nomes) - set(disponiveis)
+        if desconhecidas:
+            raise CommandError(f"Consultas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+        explain = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError("--analyze só é suportado no PostgreSQL.")
+            explain = {'analyze': True, 'buffers': True}
+
+        for nome in nomes:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {nome} ({connection.vendor})"))
+            # select_for_update só pode ser montado dentro de uma transação.
+            with transaction.atomic():
+                self.stdout.write(disponiveis[nome].explain(**explain))
+            self.stdout.write('')
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from doacoes.utils import dados_sinteticos
+
+
+class Command(BaseCommand):
+    help = "Gera usuários, categorias, locais, recebedores, doações e distribuições sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=20)
+        parser.add_argument('--categorias', type=int, default=5)
+        parser.add_argument('--locais', type=int, default=3)
+        parser.add_argument('--recebedores', type=int, default=20)
+        parser.add_argument('--doacoes', type=int, default=100)
+        parser.add_argument('--distribuicoes', type=int, default=50)
+        parser.add_argument('--lote', type=int, default=dados_sinteticos.TAMANHO_LOTE,
+                            help="Linhas por bulk_create/transação.")
+        parser.add_argument('--semente', type=int, default=None, help="Semente para gerar dados reprodutíveis.")
+        parser.add_argument('--prefixo', default='sint', help="Início dos nomes gerados.")
+
+    def handle(self, *args, **options):
+        def progresso(modelo, criados, total):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{modelo}: {criados}/{total}")
+
+        criados = dados_sinteticos.gerar(
+            usuarios=options['usuarios'],
+            categorias=options['categorias'],
+            locais=options['locais'],
+            recebedores=options['recebedores'],
+            doacoes=options['doacoes'],
+            distribuicoes=options['distribuicoes'],
+            semente=options['semente'],
+            prefixo=options['prefixo'],
+            lote=options['lote'],
+            progresso=progresso,
+        )
+        for modelo, total in criados.items():
+            self.stdout.write(f"{modelo}: {total}")
+        self.stdout.write(self.style.SUCCESS("Dados sintéticos gerados."))
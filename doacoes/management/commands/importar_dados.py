@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from doacoes.utils import importacao
+
+
+class Command(BaseCommand):
+    help = "Importa recebedores, doações ou usuários de um arquivo CSV, JSON ou JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(importacao.IMPORTADORES))
+        parser.add_argument('arquivo')
+        parser.add_argument('--formato', choices=importacao.FORMATOS,
+                            help="Padrão: deduzido da extensão do arquivo.")
+        parser.add_argument('--lote', type=int, default=importacao.TAMANHO_LOTE,
+                            help="Registros por bulk_create.")
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or importacao.formato_do_arquivo(options['arquivo'])
+        if not formato:
+            raise CommandError("Não foi possível deduzir o formato; use --formato.")
+
+        inicio = time.perf_counter()
+        try:
+            with open(options['arquivo'], 'rb') as arquivo:
+                resultado = importacao.importar(options['tipo'], arquivo, formato, options['lote'])
+        except OSError as erro:
+            raise CommandError(str(erro))
+        except ValueError as erro:
+            raise CommandError(f"Arquivo inválido: {erro}")
+        duracao = time.perf_counter() - inicio
+
+        for linha, erro in resultado.rejeitados:
+            self.stderr.write(f"linha {linha}: {erro}")
+
+        total = resultado.importados + len(resultado.rejeitados)
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.importados} importado(s), {len(resultado.rejeitados)} rejeitado(s) "
+            f"em {duracao:.2f}s ({total / duracao if duracao else total:.0f} registros/s)."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from doacoes.utils import estoque
+
+
+class Command(BaseCommand):
+    help = "Reconstrói a tabela de saldos de estoque a partir das doações pendentes, ou apenas a verifica."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar', action='store_true',
+            help="Apenas compara os saldos gravados com os calculados, sem alterar nada."
+        )
+
+    def handle(self, *args, **options):
+        if options['verificar']:
+            divergentes = estoque.divergencias()
+            for (cid, lid), (atual, esperado) in sorted(divergentes.items()):
+                self.stdout.write(
+                    f"categoria={cid} local={lid}: gravado={atual} esperado={esperado}"
+                )
+            if divergentes:
+                raise CommandError(f"{len(divergentes)} saldo(s) divergente(s).")
+            self.stdout.write(self.style.SUCCESS("Saldos de estoque consistentes."))
+            return
+
+        total = estoque.reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"{total} saldo(s) de estoque reconstruído(s)."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from doacoes.utils import duplicados
+
+
+class Command(BaseCommand):
+    help = "Lista os CPF/CNPJ cadastrados em mais de um recebedor (ou perfil)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modelo', choices=sorted(duplicados.MODELOS), default='recebedores')
+
+    def handle(self, *args, **options):
+        grupos = duplicados.grupos_duplicados(duplicados.MODELOS[options['modelo']])
+        for documento, ids in grupos.items():
+            self.stdout.write(f"{documento}: {len(ids)} registros (ids {', '.join(map(str, ids))})")
+        registros = sum(len(ids) for ids in grupos.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(grupos)} documento(s) duplicado(s) em {registros} registro(s)."
+        ))
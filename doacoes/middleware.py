@@ -0,0 +1,109 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger('doacoes.instrumentacao')
+
+
+class _Medidor:
+    def __init__(self, guardar_sql):
+        self.consultas = 0
+        self.tempo_sql = 0.0
+        self.guardar_sql = guardar_sql
+        self.sqls = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.consultas += 1
+            self.tempo_sql += duracao
+            if self.guardar_sql:
+                self.sqls.append((round(duracao * 1000, 2), sql))
+
+
+def _instalar(medidor):
+    connection.execute_wrappers.append(medidor)
+
+
+def _remover(medidor):
+    connection.execute_wrappers.remove(medidor)
+
+
+class InstrumentacaoConsultasMiddleware:
+    """
+    Mede, por requisição, o número de consultas, o tempo gasto em SQL e o
+    tempo total da view. Publica os valores no cabeçalho Server-Timing e
+    numa linha de log em JSON; acima de INSTRUMENTACAO_LIMITE_CONSULTAS,
+    registra também o SQL executado.
+
+    Só é ativado com INSTRUMENTACAO_ATIVA = True. Sob ASGI, o medidor é
+    instalado na thread em que as consultas da requisição rodam.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTACAO_ATIVA', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.limite = getattr(settings, 'INSTRUMENTACAO_LIMITE_CONSULTAS', None)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medidor = _Medidor(guardar_sql=self.limite is not None)
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(medidor):
+            response = self.get_response(request)
+        return self._registrar(request, response, medidor, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        medidor = _Medidor(guardar_sql=self.limite is not None)
+        inicio = time.perf_counter()
+        # O ORM assíncrono executa na thread "thread sensitive" da requisição;
+        # é na conexão dessa thread que o wrapper precisa estar.
+        await sync_to_async(_instalar)(medidor)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remover)(medidor)
+        return self._registrar(request, response, medidor, time.perf_counter() - inicio)
+
+    def _registrar(self, request, response, medidor, total):
+        match = request.resolver_match
+        rota = match.view_name if match else None
+
+        response['Server-Timing'] = (
+            f'db;dur={medidor.tempo_sql * 1000:.2f};desc="{medidor.consultas} consultas", '
+            f'app;dur={total * 1000:.2f}'
+        )
+
+        registro = {
+            'rota': rota,
+            'metodo': request.method,
+            'status': response.status_code,
+            'consultas': medidor.consultas,
+            'sql_ms': round(medidor.tempo_sql * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }
+        logger.info(json.dumps(registro))
+
+        if self.limite is not None and medidor.consultas > self.limite:
+            logger.warning(json.dumps({
+                **registro,
+                'limite': self.limite,
+                'sql': [{'ms': ms, 'sql': sql} for ms, sql in medidor.sqls],
+            }))
+
+        return response
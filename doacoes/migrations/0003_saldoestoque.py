@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def popular_saldos(apps, schema_editor):
+    Doacao = apps.get_model('doacoes', 'Doacao')
+    SaldoEstoque = apps.get_model('doacoes', 'SaldoEstoque')
+    linhas = (
+        Doacao.objects
+        .filter(status='pendente')
+        .values('categoria_id', 'local_entrega_id')
+        .annotate(total=Sum('quantidade'))
+    )
+    SaldoEstoque.objects.bulk_create([
+        SaldoEstoque(
+            categoria_id=l['categoria_id'],
+            local_entrega_id=l['local_entrega_id'],
+            quantidade=l['total'] or 0
+        )
+        for l in linhas
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0002_localentrega_alter_doacao_local_entrega'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoEstoque',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantidade', models.IntegerField(default=0, verbose_name='Quantidade disponível')),
+                ('categoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos', to='doacoes.categoria')),
+                ('local_entrega', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos', to='doacoes.localentrega')),
+            ],
+            options={
+                'verbose_name': 'Saldo de estoque',
+                'verbose_name_plural': 'Saldos de estoque',
+                'constraints': [models.UniqueConstraint(fields=('categoria', 'local_entrega'), name='saldo_categoria_local_unico')],
+            },
+        ),
+        migrations.RunPython(popular_saldos, migrations.RunPython.noop),
+    ]
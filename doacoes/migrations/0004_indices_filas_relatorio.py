@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 15:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0003_saldoestoque'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='distribuicao',
+            index=models.Index(fields=['data_distribuicao'], name='distrib_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='distribuicao',
+            index=models.Index(fields=['doacao', 'data_distribuicao'], name='distrib_doacao_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doacao',
+            index=models.Index(fields=['status', 'data_criacao'], name='doacao_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doacao',
+            index=models.Index(condition=models.Q(('status', 'pendente')), fields=['categoria', 'data_criacao'], name='doacao_pend_cat_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doacao',
+            index=models.Index(condition=models.Q(('status', 'pendente')), fields=['local_entrega', 'data_criacao'], name='doacao_pend_local_data_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:00
+
+import re
+
+from django.db import migrations, models
+
+
+def preencher_documentos(apps, schema_editor):
+    for nome in ('Recebedor', 'Perfil'):
+        Modelo = apps.get_model('doacoes', nome)
+        objetos = list(Modelo.objects.only('id', 'cpf_cnpj'))
+        for obj in objetos:
+            obj.documento = re.sub(r'[^0-9]', '', obj.cpf_cnpj or '')
+        Modelo.objects.bulk_update(objetos, ['documento'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0004_indices_filas_relatorio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='documento',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='Documento normalizado'),
+        ),
+        migrations.AddField(
+            model_name='recebedor',
+            name='documento',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, verbose_name='Documento normalizado'),
+        ),
+        migrations.RunPython(preencher_documentos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:01
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def preencher_nome_busca(apps, schema_editor):
+    Recebedor = apps.get_model('doacoes', 'Recebedor')
+    recebedores = list(Recebedor.objects.only('id', 'nome'))
+    for r in recebedores:
+        decomposto = unicodedata.normalize('NFKD', r.nome or '')
+        sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+        r.nome_busca = ' '.join(sem_acentos.casefold().split())[:100]
+    Recebedor.objects.bulk_update(recebedores, ['nome_busca'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0005_documento_normalizado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recebedor',
+            name='nome_busca',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, verbose_name='Nome normalizado'),
+        ),
+        migrations.AlterField(
+            model_name='recebedor',
+            name='telefone',
+            field=models.CharField(blank=True, db_index=True, max_length=20, null=True, verbose_name='Telefone'),
+        ),
+        migrations.RunPython(preencher_nome_busca, migrations.RunPython.noop),
+    ]
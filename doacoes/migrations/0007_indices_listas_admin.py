@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0006_busca_recebedores'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='localentrega',
+            name='nome',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='perfil',
+            name='tipo',
+            field=models.CharField(choices=[('doador', 'Doador'), ('voluntario', 'Voluntário'), ('administrador', 'Administrador')], db_index=True, max_length=20, verbose_name='Tipo de usuário'),
+        ),
+    ]
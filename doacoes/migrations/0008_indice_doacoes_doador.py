@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0007_indices_listas_admin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doacao',
+            index=models.Index(fields=['doador', 'data_criacao'], name='doacao_doador_data_idx'),
+        ),
+    ]
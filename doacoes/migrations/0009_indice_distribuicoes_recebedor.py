@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doacoes', '0008_indice_doacoes_doador'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='distribuicao',
+            index=models.Index(fields=['recebedor', 'data_distribuicao'], name='distrib_recebedor_data_idx'),
+        ),
+    ]
@@ -1,8 +1,17 @@
+from collections import defaultdict
+
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
+from .utils.documentos import normalizar_documento
+from .utils.texto import normalizar_busca
+
 class Categoria(models.Model):
     nome = models.CharField("Nome da categoria", max_length=100, unique=True)
 
@@ -14,7 +23,7 @@ class Categoria(models.Model):
         return self.nome
 
 class LocalEntrega(models.Model):
-    nome = models.CharField(max_length=100)
+    nome = models.CharField(max_length=100, db_index=True)
 
     def __str__(self):
         return self.nome
@@ -23,7 +32,18 @@ class Recebedor(models.Model):
     nome = models.CharField("Nome do Recebedor", max_length=100)
     cpf_cnpj = models.CharField("CPF/CNPJ", max_length=20)
     endereco = models.TextField("Endereço")
-    telefone = models.CharField("Telefone", max_length=20, blank=True, null=True)
+    telefone = models.CharField("Telefone", max_length=20, blank=True, null=True, db_index=True)
+    documento = models.CharField("Documento normalizado", max_length=20, blank=True, editable=False, db_index=True)
+    nome_busca = models.CharField("Nome normalizado", max_length=100, blank=True, editable=False, db_index=True)
+
+    def normalizar(self):
+        # Chamado por save() e, explicitamente, pelos caminhos de bulk_create.
+        self.documento = normalizar_documento(self.cpf_cnpj)
+        self.nome_busca = normalizar_busca(self.nome)[:100]
+
+    def save(self, *args, **kwargs):
+        self.normalizar()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.nome} – {self.cpf_cnpj}"
@@ -38,6 +58,22 @@ class Doacao(models.Model):
     data_criacao = models.DateTimeField(auto_now_add=True)
     status = models.CharField("Status", max_length=20, choices=[('pendente', 'Pendente'), ('distribuida', 'Distribuída')], default='pendente')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'data_criacao'], name='doacao_status_data_idx'),
+            models.Index(
+                fields=['categoria', 'data_criacao'],
+                condition=models.Q(status='pendente'),
+                name='doacao_pend_cat_data_idx'
+            ),
+            models.Index(
+                fields=['local_entrega', 'data_criacao'],
+                condition=models.Q(status='pendente'),
+                name='doacao_pend_local_data_idx'
+            ),
+            models.Index(fields=['doador', 'data_criacao'], name='doacao_doador_data_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.pk:
             self.quantidade_inicial = self.quantidade
@@ -52,12 +88,34 @@ class Distribuicao(models.Model):
     quantidade_distribuida = models.PositiveIntegerField()
     data_distribuicao = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['data_distribuicao'], name='distrib_data_idx'),
+            models.Index(fields=['doacao', 'data_distribuicao'], name='distrib_doacao_data_idx'),
+            models.Index(fields=['recebedor', 'data_distribuicao'], name='distrib_recebedor_data_idx'),
+        ]
+
     def __str__(self):
         return (
             f"{self.recebedor.nome} recebeu "
             f"{self.quantidade_distribuida} de {self.doacao.categoria.nome}"
         )
 
+class SaldoEstoque(models.Model):
+    categoria = models.ForeignKey(Categoria, on_delete=models.CASCADE, related_name='saldos')
+    local_entrega = models.ForeignKey(LocalEntrega, on_delete=models.CASCADE, related_name='saldos')
+    quantidade = models.IntegerField("Quantidade disponível", default=0)
+
+    class Meta:
+        verbose_name = "Saldo de estoque"
+        verbose_name_plural = "Saldos de estoque"
+        constraints = [
+            models.UniqueConstraint(fields=['categoria', 'local_entrega'], name='saldo_categoria_local_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.categoria.nome} em {self.local_entrega.nome} – {self.quantidade} un."
+
 class Perfil(models.Model):
     TIPO_CHOICES = [
         ('doador', 'Doador'),
@@ -65,11 +123,16 @@ class Perfil(models.Model):
         ('administrador', 'Administrador'),
     ]
     usuario = models.OneToOneField(User, on_delete=models.CASCADE)
-    tipo = models.CharField("Tipo de usuário", max_length=20, choices=TIPO_CHOICES)
+    tipo = models.CharField("Tipo de usuário", max_length=20, choices=TIPO_CHOICES, db_index=True)
     cpf_cnpj = models.CharField("CPF/CNPJ", max_length=20, blank=True, null=True)
     data_nascimento_fundacao = models.DateField("Nascimento/Fundação", blank=True, null=True)
     endereco = models.TextField("Endereço", blank=True, null=True)
     telefone = models.CharField("Telefone", max_length=20, blank=True, null=True)
+    documento = models.CharField("Documento normalizado", max_length=20, blank=True, editable=False, db_index=True)
+
+    def save(self, *args, **kwargs):
+        self.documento = normalizar_documento(self.cpf_cnpj)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.usuario.username} ({self.tipo})"
@@ -86,3 +149,71 @@ def criar_perfil(sender, instance, created, **kwargs):
 def salvar_perfil(sender, instance, **kwargs):
     if hasattr(instance, 'perfil'):
         instance.perfil.save()
+
+def _parcela_estoque(doacao):
+    # O que a doação soma ao saldo do seu par (categoria, local_entrega).
+    if doacao is None or doacao.status != 'pendente' or not doacao.quantidade:
+        return {}
+    return {(doacao.categoria_id, doacao.local_entrega_id): doacao.quantidade}
+
+@receiver(pre_save, sender=Doacao)
+def guardar_parcela_anterior(sender, instance, raw=False, **kwargs):
+    anterior = None
+    if instance.pk and not raw:
+        anterior = (
+            Doacao.objects
+            .filter(pk=instance.pk)
+            .only('categoria_id', 'local_entrega_id', 'quantidade', 'status')
+            .first()
+        )
+    instance._parcela_anterior = _parcela_estoque(anterior)
+
+@receiver(post_save, sender=Doacao)
+def movimentar_saldo_doacao_salva(sender, instance, raw=False, **kwargs):
+    # Doacao.save() vem do admin e de código avulso; os caminhos em lote
+    # (bulk_create/bulk_update) não disparam sinais e movimentam o saldo
+    # por conta própria.
+    if raw:
+        return
+    from .utils import estoque
+    deltas = defaultdict(int, _parcela_estoque(instance))
+    for chave, quantidade in instance.__dict__.pop('_parcela_anterior', {}).items():
+        deltas[chave] -= quantidade
+    estoque.movimentar(deltas)
+
+@receiver(post_delete, sender=Doacao)
+def baixar_saldo_doacao_excluida(sender, instance, **kwargs):
+    if instance.status == 'pendente' and instance.quantidade:
+        SaldoEstoque.objects.filter(
+            categoria_id=instance.categoria_id,
+            local_entrega_id=instance.local_entrega_id
+        ).update(quantidade=F('quantidade') - instance.quantidade)
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=Categoria)
+@receiver([post_save, post_delete], sender=Recebedor)
+@receiver([post_save, post_delete], sender=LocalEntrega)
+@receiver([post_save, post_delete], sender=Doacao)
+@receiver([post_save, post_delete], sender=Distribuicao)
+def invalidar_contadores_painel(sender, created=True, **kwargs):
+    # Desses cadastros o painel só conta linhas, que não mudam ao editar;
+    # ignorar as edições evita esvaziar o cache a cada login (last_login).
+    if sender in (User, Recebedor, LocalEntrega) and not created:
+        return
+    from .utils import contadores
+    transaction.on_commit(contadores.invalidar)
+
+@receiver([post_save, post_delete], sender=Categoria)
+@receiver([post_save, post_delete], sender=LocalEntrega)
+@receiver([post_save, post_delete], sender=Doacao)
+@receiver([post_save, post_delete], sender=Distribuicao)
+def renovar_versao_estoque(sender, **kwargs):
+    from .utils import estoque
+    transaction.on_commit(estoque.renovar_versao)
+
+@receiver(connection_created)
+def configurar_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    for nome, valor in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f"PRAGMA {nome} = {valor}")
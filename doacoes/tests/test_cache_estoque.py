@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from doacoes.models import Categoria, LocalEntrega
+from doacoes.utils import estoque
+from doacoes.utils.recebimento import registrar_doacoes
+
+
+class CacheEstoqueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voluntario = User.objects.create_user('voluntario')
+        cls.categoria = Categoria.objects.create(nome='Roupas')
+        cls.local = LocalEntrega.objects.create(nome='Centro')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.voluntario)
+
+    def _listar(self, **cabecalhos):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(reverse('listar_doacoes'), headers=cabecalhos)
+        estoque = [q for q in consultas if 'saldoestoque' in q['sql']]
+        return resposta, estoque
+
+    def test_consulta_sem_mudanca_responde_304_sem_consultar_o_estoque(self):
+        primeira, estoque = self._listar()
+        self.assertEqual(primeira.status_code, 200)
+        self.assertEqual(len(estoque), 1)
+
+        repetida, estoque = self._listar(if_none_match=primeira['ETag'])
+        self.assertEqual(repetida.status_code, 304)
+        self.assertEqual(estoque, [])
+
+        sem_etag, estoque = self._listar()
+        self.assertEqual(sem_etag.status_code, 200)
+        self.assertEqual(estoque, [])
+
+    def test_versao_lida_uma_vez_por_requisicao(self):
+        with mock.patch.object(estoque, 'versao', wraps=estoque.versao) as versao:
+            resposta, _ = self._listar()
+        self.assertEqual(versao.call_count, 1)
+        self.assertEqual(resposta['ETag'], f'"{estoque.versao()}"')
+
+    def test_doacao_muda_a_versao(self):
+        primeira, _ = self._listar()
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_doacoes(self.voluntario, self.local, {self.categoria: 7})
+
+        nova, estoque = self._listar(if_none_match=primeira['ETag'])
+        self.assertEqual(nova.status_code, 200)
+        self.assertEqual(len(estoque), 1)
+        self.assertNotEqual(nova['ETag'], primeira['ETag'])
+        self.assertContains(nova, 'Roupas')
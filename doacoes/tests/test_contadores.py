@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from doacoes.models import Recebedor
+from doacoes.utils import contadores
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ContadoresPainelTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='senha')
+        cls.admin.perfil.tipo = 'administrador'
+        cls.admin.perfil.save()
+
+    def setUp(self):
+        cache.clear()
+        contadores.obter()
+
+    def test_login_mantem_o_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resposta = self.client.post(reverse('login'), {'username': 'admin', 'senha': 'senha'})
+        self.assertRedirects(resposta, reverse('admin_dashboard'), fetch_redirect_response=False)
+        self.assertIsNotNone(cache.get(contadores.CHAVE))
+
+    def test_edicao_de_recebedor_mantem_o_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            recebedor = Recebedor.objects.create(nome='Ana', cpf_cnpj='0', endereco='-')
+        self.assertIsNone(cache.get(contadores.CHAVE))
+
+        contadores.obter()
+        with self.captureOnCommitCallbacks(execute=True):
+            recebedor.endereco = 'Rua A'
+            recebedor.save()
+        self.assertEqual(cache.get(contadores.CHAVE)['num_recebedores'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recebedor.delete()
+        self.assertIsNone(cache.get(contadores.CHAVE))
@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from doacoes.models import Categoria, Doacao, LocalEntrega, Recebedor, SaldoEstoque
+from doacoes.utils.distribuicao import EstoqueInsuficiente, _necessarias, distribuir
+from doacoes.utils.recebimento import registrar_doacoes
+
+
+class DistribuicaoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doador = User.objects.create_user('doador')
+        cls.local = LocalEntrega.objects.create(nome='Centro')
+        cls.roupas = Categoria.objects.create(nome='Roupas')
+        cls.agua = Categoria.objects.create(nome='Água')
+        cls.recebedor = Recebedor.objects.create(nome='Ana', cpf_cnpj='0', endereco='-')
+        for qtd in (3, 4, 5, 6):
+            registrar_doacoes(cls.doador, cls.local, {cls.roupas: qtd, cls.agua: qtd})
+
+    def _fila(self, categoria):
+        return list(Doacao.objects.filter(categoria=categoria).order_by('data_criacao', 'id'))
+
+    def test_le_so_as_doacoes_que_cobrem_o_pedido(self):
+        roupas = self._fila(self.roupas)
+        agua = self._fila(self.agua)
+        ids = set(_necessarias({self.roupas.id: 1, self.agua.id: 8}).values_list('id', flat=True))
+        self.assertEqual(ids, {roupas[0].id, agua[0].id, agua[1].id, agua[2].id})
+
+    def test_consome_as_mais_antigas_primeiro(self):
+        with CaptureQueriesContext(connection) as poucas:
+            distribuir(self.recebedor, {self.roupas.id: 1})
+        with CaptureQueriesContext(connection) as varias:
+            distribuir(self.recebedor, {self.roupas.id: 9, self.agua.id: 10})
+
+        self.assertEqual(len(varias), len(poucas))
+        self.assertEqual([d.quantidade for d in self._fila(self.roupas)], [0, 0, 2, 6])
+        self.assertEqual([d.quantidade for d in self._fila(self.agua)], [0, 0, 2, 6])
+        self.assertEqual(
+            dict(SaldoEstoque.objects.values_list('categoria_id', 'quantidade')),
+            {self.roupas.id: 8, self.agua.id: 8},
+        )
+
+    def test_estoque_insuficiente_nao_altera_nada(self):
+        with self.assertRaises(EstoqueInsuficiente) as erro:
+            distribuir(self.recebedor, {self.roupas.id: 19})
+        self.assertEqual(erro.exception.disponivel, 18)
+        self.assertEqual([d.quantidade for d in self._fila(self.roupas)], [3, 4, 5, 6])
@@ -0,0 +1,35 @@
+import random
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from validate_docbr import CPF, CNPJ  # type: ignore
+
+from doacoes.utils import documentos
+from doacoes.utils.validacao import limpar_telefone
+
+
+class DocumentosTests(SimpleTestCase):
+
+    def test_concorda_com_validate_docbr(self):
+        aleatorio = random.Random(7)
+        cpf, cnpj = CPF(), CNPJ()
+        amostra = [cpf.generate() for _ in range(300)] + [cnpj.generate() for _ in range(300)]
+        amostra += [f"{aleatorio.randrange(10 ** 11):011d}" for _ in range(300)]
+        amostra += [f"{aleatorio.randrange(10 ** 14):014d}" for _ in range(300)]
+        amostra += ['00000000000', '11111111111111']
+
+        for valor, (digitos, erro) in zip(amostra, documentos.validar_lote(amostra)):
+            esperado = cpf.validate(valor) if len(valor) == 11 else cnpj.validate(valor)
+            self.assertEqual(erro is None, esperado, valor)
+            self.assertEqual(digitos, valor)
+
+    def test_normaliza_pontuacao_e_rejeita_tamanho(self):
+        self.assertEqual(documentos.validar('529.982.247-25'), ('52998224725', None))
+        self.assertEqual(documentos.validar('11.222.333/0001-81'), ('11222333000181', None))
+        self.assertEqual(documentos.validar('123'), ('123', documentos.TAMANHO_INVALIDO))
+        self.assertEqual(documentos.validar(None), ('', documentos.TAMANHO_INVALIDO))
+
+    def test_telefone_so_aceita_digitos_ascii(self):
+        self.assertEqual(limpar_telefone('(51) 99999-9999'), '51999999999')
+        with self.assertRaises(ValidationError):
+            limpar_telefone('٥١٩٩٩٩٩٩٩٩٩')
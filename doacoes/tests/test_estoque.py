@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from doacoes.models import Categoria, Doacao, LocalEntrega, SaldoEstoque
+from doacoes.utils import estoque
+
+
+class SaldoDoacaoSalvaTests(TestCase):
+    """Doações gravadas com save(), como faz o Django admin, movimentam o saldo."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doador = User.objects.create_user('doador')
+        cls.roupas = Categoria.objects.create(nome='Roupas')
+        cls.agua = Categoria.objects.create(nome='Água')
+        cls.centro = LocalEntrega.objects.create(nome='Centro')
+        cls.norte = LocalEntrega.objects.create(nome='Norte')
+
+    def _saldos(self):
+        return {
+            (s.categoria_id, s.local_entrega_id): s.quantidade
+            for s in SaldoEstoque.objects.exclude(quantidade=0)
+        }
+
+    def _doar(self, quantidade=5):
+        return Doacao.objects.create(
+            categoria=self.roupas, local_entrega=self.centro, doador=self.doador,
+            descricao='Camisetas', quantidade=quantidade,
+        )
+
+    def test_criacao_credita_o_saldo(self):
+        self._doar()
+        self.assertEqual(self._saldos(), {(self.roupas.id, self.centro.id): 5})
+        self.assertEqual(estoque.divergencias(), {})
+
+    def test_edicao_move_a_diferenca(self):
+        doacao = self._doar()
+        doacao.quantidade = 8
+        doacao.save()
+        self.assertEqual(self._saldos(), {(self.roupas.id, self.centro.id): 8})
+
+        doacao.categoria = self.agua
+        doacao.local_entrega = self.norte
+        doacao.save()
+        self.assertEqual(self._saldos(), {(self.agua.id, self.norte.id): 8})
+        self.assertEqual(estoque.divergencias(), {})
+
+    def test_mudanca_de_status_tira_e_devolve_o_saldo(self):
+        doacao = self._doar()
+        doacao.status = 'distribuida'
+        doacao.save()
+        self.assertEqual(self._saldos(), {})
+
+        doacao.status = 'pendente'
+        doacao.save()
+        self.assertEqual(self._saldos(), {(self.roupas.id, self.centro.id): 5})
+        self.assertEqual(estoque.divergencias(), {})
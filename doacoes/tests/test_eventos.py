@@ -0,0 +1,65 @@
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from doacoes.models import Categoria, LocalEntrega
+from doacoes.utils import eventos
+from doacoes.utils.recebimento import registrar_doacoes
+
+
+class BrokerLocalTests(SimpleTestCase):
+
+    async def test_entrega_eventos_publicados_de_outra_thread(self):
+        broker = eventos.BrokerLocal()
+        with broker.assinar() as assinatura:
+            outra = threading.Thread(target=broker.publicar, args=([{'saldo': 1}, {'saldo': 2}],))
+            outra.start()
+            outra.join()
+            self.assertEqual(await assinatura.proximo(timeout=1), {'saldo': 1})
+            self.assertEqual(await assinatura.proximo(timeout=1), {'saldo': 2})
+        self.assertEqual(broker._assinaturas, set())
+
+
+class EventosEstoqueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voluntario = User.objects.create_user('voluntario')
+        cls.categoria = Categoria.objects.create(nome='Roupas')
+        cls.local = LocalEntrega.objects.create(nome='Centro')
+
+    def _doar(self, quantidade):
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_doacoes(self.voluntario, self.local, {self.categoria: quantidade})
+
+    async def test_fluxo_recebe_novo_saldo_apos_commit(self):
+        await self.async_client.aforce_login(self.voluntario)
+        resposta = await self.async_client.get(reverse('eventos_estoque'))
+        self.assertEqual(resposta['Content-Type'], 'text/event-stream')
+
+        fluxo = aiter(resposta.streaming_content)
+        self.assertEqual(await anext(fluxo), b'retry: 5000\n\n')
+        await sync_to_async(self._doar)(3)
+        await sync_to_async(self._doar)(4)
+
+        for saldo in (3, 7):
+            evento, dados = (await anext(fluxo)).decode().strip().split('\n')
+            self.assertEqual(evento, 'event: saldo')
+            self.assertEqual(json.loads(dados.removeprefix('data: ')), {
+                'categoria': self.categoria.id, 'local_entrega': self.local.id, 'saldo': saldo,
+            })
+        await fluxo.aclose()
+
+    def test_wsgi_nao_abre_o_fluxo(self):
+        self.client.force_login(self.voluntario)
+        self.assertEqual(self.client.get(reverse('eventos_estoque')).status_code, 204)
+        self.assertNotContains(self.client.get(reverse('listar_doacoes')), 'EventSource')
+
+    async def test_asgi_assina_o_fluxo_na_lista(self):
+        await self.async_client.aforce_login(self.voluntario)
+        resposta = await self.async_client.get(reverse('listar_doacoes'))
+        self.assertContains(resposta, reverse('eventos_estoque'))
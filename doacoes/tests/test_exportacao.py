@@ -0,0 +1,33 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from doacoes.models import Distribuicao, Doacao
+from doacoes.utils import dados_sinteticos
+
+
+class ExportacaoRelatorioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin')
+        cls.admin.perfil.tipo = 'administrador'
+        cls.admin.perfil.save()
+        dados_sinteticos.gerar(doacoes=30, distribuicoes=20, semente=8)
+
+    async def _exportar_asgi(self):
+        await self.async_client.aforce_login(self.admin)
+        resposta = await self.async_client.get(reverse('admin_relatorio_exportar'))
+        self.assertTrue(resposta.is_async)
+        return b''.join([parte async for parte in resposta.streaming_content])
+
+    def test_asgi_transmite_com_iterador_assincrono(self):
+        conteudo = async_to_sync(self._exportar_asgi)()
+
+        self.client.force_login(self.admin)
+        sincrona = self.client.get(reverse('admin_relatorio_exportar'))
+        self.assertFalse(sincrona.is_async)
+        self.assertEqual(conteudo, b''.join(sincrona.streaming_content))
+        linhas = 1 + Doacao.objects.filter(status='pendente').count() + Distribuicao.objects.count()
+        self.assertEqual(conteudo.decode('utf-8-sig').count('\r\n'), linhas)
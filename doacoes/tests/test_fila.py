@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from doacoes.models import Doacao
+from doacoes.utils import dados_sinteticos, fila
+
+
+class FilaPendentesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dados_sinteticos.gerar(doacoes=45, distribuicoes=10, semente=5)
+        # Metade com o mesmo instante, para o desempate por id.
+        ids = list(Doacao.objects.values_list('id', flat=True)[:20])
+        Doacao.objects.filter(id__in=ids).update(data_criacao=timezone.now())
+
+    def test_percorre_todas_as_pendentes_das_mais_antigas_para_as_novas(self):
+        vistas, cursor = [], None
+        while True:
+            doacoes, cursor = fila.pagina(cursor, tamanho=7)
+            vistas.extend(doacoes)
+            if not cursor:
+                break
+
+        esperadas = list(Doacao.objects.filter(status='pendente').order_by('data_criacao', 'id'))
+        self.assertEqual(vistas, esperadas)
+
+    def test_contagem_por_categoria(self):
+        contagem = fila.pendentes_por_categoria()
+        self.assertEqual(sum(c['doacoes'] for c in contagem), Doacao.objects.filter(status='pendente').count())
+
+    def test_doador_nao_ve_a_fila(self):
+        self.client.force_login(User.objects.create_user('doador'))
+        self.assertEqual(self.client.get(reverse('home_voluntario')).status_code, 302)
@@ -0,0 +1,83 @@
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from doacoes.models import Categoria, Doacao, LocalEntrega, Recebedor, SaldoEstoque
+from doacoes.forms import FormRecebedor
+from doacoes.utils import contadores, duplicados, importacao
+
+
+class ImportacaoTests(TestCase):
+
+    def test_recebedores_csv_rejeita_documento_e_telefone_invalidos(self):
+        conteudo = (
+            "nome,cpf_cnpj,endereco,telefone\n"
+            "Ana,529.982.247-25,Rua A,(51) 99999-9999\n"
+            "Bruno,111.111.111-12,Rua B,51999999999\n"
+            "Carla,11.222.333/0001-81,Rua C,123\n"
+            ",52998224725,Rua D,\n"
+            "Diego,390.533.447-05,Rua E,\n"
+        )
+        resultado = importacao.importar('recebedores', io.BytesIO(conteudo.encode()), 'csv')
+
+        self.assertEqual(resultado.importados, 1)
+        self.assertEqual([linha for linha, _ in resultado.rejeitados], [3, 4, 5, 6])
+        self.assertEqual(Recebedor.objects.get().cpf_cnpj, '52998224725')
+
+    def test_doacoes_jsonl_credita_estoque(self):
+        User.objects.create_user('empresa')
+        Categoria.objects.create(nome='Água')
+        LocalEntrega.objects.create(nome='Centro')
+        linhas = [
+            {'categoria': 'água', 'local_entrega': 'Centro', 'doador': 'empresa', 'quantidade': 10},
+            {'categoria': 'água', 'local_entrega': 'Centro', 'doador': 'empresa', 'quantidade': '5'},
+            {'categoria': 'Roupas', 'local_entrega': 'Centro', 'doador': 'empresa', 'quantidade': 1},
+            {'categoria': 'água', 'local_entrega': 'Centro', 'doador': 'ninguem', 'quantidade': 1},
+        ]
+        conteudo = '\n'.join(json.dumps(l) for l in linhas) + '\n{quebrado\n'
+        resultado = importacao.importar('doacoes', io.BytesIO(conteudo.encode()), 'jsonl', lote=2)
+
+        self.assertEqual(resultado.importados, 2)
+        self.assertEqual([linha for linha, _ in resultado.rejeitados], [3, 4, 5])
+        self.assertEqual(sorted(Doacao.objects.values_list('quantidade_inicial', flat=True)), [5, 10])
+        self.assertEqual(SaldoEstoque.objects.get().quantidade, 15)
+
+    def test_usuarios_json_cria_perfil_e_rejeita_duplicados(self):
+        User.objects.create_user('existente')
+        registros = [
+            {'username': 'novo', 'tipo': 'voluntario', 'telefone': '5133334444'},
+            {'username': 'novo', 'tipo': 'doador'},
+            {'username': 'existente'},
+            {'username': 'chefe', 'tipo': 'administrador'},
+        ]
+        contadores.obter()
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = importacao.importar('usuarios', io.BytesIO(json.dumps(registros).encode()), 'json')
+
+        self.assertEqual(resultado.importados, 1)
+        self.assertEqual(len(resultado.rejeitados), 3)
+        novo = User.objects.get(username='novo')
+        self.assertEqual(novo.perfil.tipo, 'voluntario')
+        self.assertFalse(novo.is_active)
+        self.assertFalse(novo.has_usable_password())
+        self.assertIsNone(cache.get(contadores.CHAVE))
+
+    def test_recebedores_rejeita_documento_ja_cadastrado(self):
+        Recebedor.objects.create(nome='Ana', cpf_cnpj='529.982.247-25', endereco='Rua A')
+        conteudo = (
+            "nome,cpf_cnpj,endereco,telefone\n"
+            "Ana de novo,52998224725,Rua A,51999999999\n"
+            "Carla,11.222.333/0001-81,Rua C,5133334444\n"
+            "Carla filial,11222333000181,Rua C,5133334444\n"
+        )
+        resultado = importacao.importar('recebedores', io.BytesIO(conteudo.encode()), 'csv')
+
+        self.assertEqual(resultado.importados, 1)
+        self.assertEqual([linha for linha, _ in resultado.rejeitados], [2, 4])
+        self.assertEqual(duplicados.grupos_duplicados(), {})
+
+        form = FormRecebedor(data={'nome': 'Ana', 'cpf_cnpj': '52998224725', 'endereco': 'Rua A'})
+        self.assertIn('cpf_cnpj', form.errors)
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from doacoes.models import Recebedor
+from doacoes.utils.paginacao import TAMANHO_PAGINA
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ListasAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='senha')
+        cls.admin.perfil.tipo = 'administrador'
+        cls.admin.perfil.save()
+        for i in range(TAMANHO_PAGINA + 5):
+            usuario = User.objects.create_user(f"maria{i:02d}", is_active=i % 2 == 0)
+            usuario.perfil.tipo = 'voluntario' if i < 3 else 'doador'
+            usuario.perfil.save()
+        User.objects.create_user('joao')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def _usuarios(self, **params):
+        resposta = self.client.get(reverse('admin_gerenciar_usuarios'), params)
+        return [u.username for u in resposta.context['usuarios']]
+
+    def test_paginacao_e_ordem(self):
+        primeira = self._usuarios(ordem='usuario')
+        self.assertEqual(len(primeira), TAMANHO_PAGINA)
+        self.assertEqual(primeira, sorted(primeira))
+        segunda = self._usuarios(ordem='usuario', pagina=2)
+        self.assertEqual(len(primeira) + len(segunda), TAMANHO_PAGINA + 7)
+        self.assertFalse(set(primeira) & set(segunda))
+        self.assertEqual(self._usuarios(ordem='inexistente', pagina=99)[-1], 'maria29')
+        self.assertEqual(self._usuarios(ordem='recentes')[0], 'joao')
+
+    def test_filtros(self):
+        self.assertEqual(self._usuarios(tipo='voluntario'), ['maria00', 'maria01', 'maria02'])
+        self.assertEqual(self._usuarios(tipo='voluntario', ativo='1'), ['maria00', 'maria02'])
+        self.assertEqual(self._usuarios(nome='jo'), ['joao'])
+
+        Recebedor.objects.create(nome='José Álvares', cpf_cnpj='0', endereco='-')
+        Recebedor.objects.create(nome='Ana', cpf_cnpj='1', endereco='-')
+        resposta = self.client.get(reverse('admin_gerenciar_recebedores'), {'nome': 'jose a'})
+        self.assertEqual([r.nome for r in resposta.context['recebedores']], ['José Álvares'])
@@ -0,0 +1,211 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from doacoes import urls
+from doacoes.models import Categoria, Distribuicao, Doacao, LocalEntrega, Recebedor, SaldoEstoque
+from doacoes.utils import dados_sinteticos
+
+
+def _novo_usuario(teste):
+    return {'usuario_id': User.objects.create_user(f"alvo{User.objects.count()}").id}
+
+
+def _novo_usuario_status(teste):
+    return {'user_id': User.objects.create_user(f"alvo{User.objects.count()}").id}
+
+
+def _nova_categoria(teste):
+    return {'categoria_id': Categoria.objects.create(nome=f"alvo{Categoria.objects.count()}").id}
+
+
+def _novo_local(teste):
+    return {'local_id': LocalEntrega.objects.create(nome='alvo').id}
+
+
+def _novo_recebedor(teste):
+    return {'recebedor_id': Recebedor.objects.create(nome='alvo', cpf_cnpj='0', endereco='-').id}
+
+
+def _recebedor_atendido(teste):
+    return {'recebedor_id': Distribuicao.objects.order_by('id').values_list('recebedor_id', flat=True)[0]}
+
+
+def _doacao_distribuida(teste):
+    return {'doacao_id': Distribuicao.objects.order_by('id').values_list('doacao_id', flat=True)[0]}
+
+
+def _doador_atendido(teste):
+    return {'doador_id': Distribuicao.objects.order_by('id').values_list('doacao__doador_id', flat=True)[0]}
+
+
+# rota: (papel, gerador de kwargs, máximo de consultas)
+ORCAMENTOS = {
+    'inicio': (None, None, 0),
+    'login': (None, None, 0),
+    'logout': ('doador', None, 4),
+    'trocar_senha': ('doador', None, 2),
+    'senha_trocada': ('doador', None, 2),
+    'home': ('doador', None, 2),
+    'registrar_usuario': (None, None, 0),
+    'cadastrar_usuario': ('admin', None, 2),
+    'editar_dados': ('doador', None, 2),
+    'home_doador': ('doador', None, 2),
+    'minhas_doacoes': ('doador', None, 4),
+    'fazer_doacoes_multiplas': ('doador', None, 4),
+    'home_voluntario': ('voluntario', None, 4),
+    'listar_doacoes': ('voluntario', None, 3),
+    'cadastrar_recebedor': ('voluntario', None, 2),
+    'distribuir_por_categoria': ('voluntario', None, 3),
+    'buscar_recebedores': ('voluntario', None, 2),
+    'historico_recebedor': ('voluntario', _recebedor_atendido, 4),
+    'historico_recebedor_json': ('voluntario', _recebedor_atendido, 4),
+    'rastrear_doacao': ('voluntario', _doacao_distribuida, 4),
+    'rastrear_doacao_json': ('voluntario', _doacao_distribuida, 4),
+    'rastrear_doador': ('voluntario', _doador_atendido, 4),
+    'rastrear_doador_json': ('voluntario', _doador_atendido, 4),
+    'admin_dashboard': ('admin', None, 8),
+    'admin_gerenciar_usuarios': ('admin', None, 4),
+    'admin_criar_usuario': ('admin', None, 2),
+    'admin_editar_usuario': ('admin', _novo_usuario, 3),
+    'admin_excluir_usuario': ('admin', _novo_usuario, 9),
+    'admin_alterar_status_usuario': ('admin', _novo_usuario_status, 6),
+    'admin_gerenciar_categorias': ('admin', None, 4),
+    'admin_criar_categoria': ('admin', None, 2),
+    'admin_editar_categoria': ('admin', _nova_categoria, 3),
+    'admin_excluir_categoria': ('admin', _nova_categoria, 6),
+    'admin_gerenciar_recebedores': ('admin', None, 4),
+    'admin_criar_recebedor': ('admin', None, 2),
+    'admin_editar_recebedor': ('admin', _novo_recebedor, 3),
+    'admin_excluir_recebedor': ('admin', _novo_recebedor, 5),
+    'admin_gerenciar_locais_entrega': ('admin', None, 4),
+    'admin_criar_local_entrega': ('admin', None, 2),
+    'admin_editar_local_entrega': ('admin', _novo_local, 3),
+    'admin_excluir_local_entrega': ('admin', _novo_local, 6),
+    'admin_importar_dados': ('admin', None, 2),
+    'admin_relatorio': ('admin', None, 8),
+    'admin_relatorio_exportar': ('admin', None, 3),
+}
+
+# Respostas que não terminam não cabem na medição abaixo; têm testes próprios.
+FLUXOS = {'eventos_estoque'}
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class OrcamentoConsultasTests(TestCase):
+    """
+    Cada rota nomeada de doacoes.urls tem um teto de consultas que não pode
+    depender do volume de dados: a contagem é medida com o banco semeado e
+    novamente depois de multiplicar o volume, e as duas precisam ser iguais.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuarios = {}
+        for papel in ('doador', 'voluntario', 'admin'):
+            usuario = User.objects.create_user(f"papel_{papel}", password='senha')
+            usuario.perfil.tipo = 'administrador' if papel == 'admin' else papel
+            usuario.perfil.save()
+            cls.usuarios[papel] = usuario
+        dados_sinteticos.gerar(semente=1)
+        cls._doacoes_do_doador(10)
+
+    @classmethod
+    def _doacoes_do_doador(cls, quantidade):
+        Doacao.objects.filter(
+            pk__in=list(Doacao.objects.order_by('?').values_list('pk', flat=True)[:quantidade])
+        ).update(doador=cls.usuarios['doador'])
+
+    def _medir(self, nome, papel, kwargs):
+        cache.clear()
+        self.client.logout()
+        if papel:
+            self.client.force_login(self.usuarios[papel])
+        url = reverse(nome, kwargs=kwargs(self) if kwargs else None)
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(url)
+            if resposta.streaming:
+                b''.join(resposta.streaming_content)
+        self.assertLess(resposta.status_code, 400, f"{nome}: HTTP {resposta.status_code}")
+        return len(consultas)
+
+    def test_todas_as_rotas_tem_orcamento(self):
+        nomes = {p.name for p in urls.urlpatterns if isinstance(p, URLPattern) and p.name}
+        self.assertEqual(nomes - set(ORCAMENTOS) - FLUXOS, set())
+
+    def test_consultas_nao_crescem_com_o_volume(self):
+        pequenas = {
+            nome: self._medir(nome, papel, kwargs)
+            for nome, (papel, kwargs, _) in ORCAMENTOS.items()
+        }
+
+        dados_sinteticos.gerar(usuarios=60, categorias=15, locais=8, recebedores=60,
+                               doacoes=400, distribuicoes=200, semente=2)
+        self._doacoes_do_doador(60)
+
+        for nome, (papel, kwargs, limite) in ORCAMENTOS.items():
+            with self.subTest(rota=nome):
+                grandes = self._medir(nome, papel, kwargs)
+                self.assertLessEqual(grandes, limite)
+                self.assertEqual(grandes, pequenas[nome])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class OrcamentoEscritaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doador = User.objects.create_user('doador', password='senha')
+        cls.voluntario = User.objects.create_user('voluntario', password='senha')
+        cls.voluntario.perfil.tipo = 'voluntario'
+        cls.voluntario.perfil.save()
+
+    def _distribuir_tudo(self):
+        recebedor = Recebedor.objects.first()
+        dados = {'recebedor': recebedor.id}
+        saldos = SaldoEstoque.objects.values_list('categoria_id').annotate(total=Sum('quantidade'))
+        for cid, disponivel in saldos:
+            if disponivel > 0:
+                dados[f'quantidade_{cid}'] = disponivel
+        self.client.force_login(self.voluntario)
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.post(reverse('distribuir_por_categoria'), dados)
+        self.assertRedirects(resposta, reverse('home_voluntario'), fetch_redirect_response=False)
+        return len(consultas)
+
+    def test_distribuicao_nao_depende_do_numero_de_doacoes(self):
+        dados_sinteticos.gerar(categorias=3, doacoes=20, distribuicoes=0, semente=3)
+        pequena = self._distribuir_tudo()
+        Categoria.objects.all().delete()
+
+        dados_sinteticos.gerar(categorias=3, doacoes=100, distribuicoes=0, semente=4)
+        grande = self._distribuir_tudo()
+
+        self.assertEqual(grande, pequena)
+        self.assertFalse(Doacao.objects.filter(status='pendente').exists())
+        self.assertFalse(SaldoEstoque.objects.exclude(quantidade=0).exists())
+
+    def _doar(self, categorias):
+        local = LocalEntrega.objects.create(nome='Centro')
+        dados = {'local_entrega': local.id, 'descricao': ''}
+        for i, cat in enumerate(categorias, start=1):
+            dados[f'quantidade_{cat.id}'] = i
+        self.client.force_login(self.doador)
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.post(reverse('fazer_doacoes_multiplas'), dados)
+        self.assertRedirects(resposta, reverse('minhas_doacoes'), fetch_redirect_response=False)
+        return len(consultas)
+
+    def test_doacao_multipla_insere_em_lote(self):
+        poucas = self._doar([Categoria.objects.create(nome=f"a{i}") for i in range(3)])
+        Categoria.objects.all().delete()
+        muitas = self._doar([Categoria.objects.create(nome=f"b{i}") for i in range(30)])
+
+        self.assertEqual(muitas, poucas)
+        self.assertEqual(Doacao.objects.count(), 30)
+        self.assertFalse(Doacao.objects.exclude(quantidade_inicial=F('quantidade')).exists())
+        self.assertEqual(SaldoEstoque.objects.aggregate(t=Sum('quantidade'))['t'], sum(range(1, 31)))
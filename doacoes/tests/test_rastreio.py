@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from doacoes.models import Distribuicao
+from doacoes.utils import dados_sinteticos
+from doacoes.utils.historico import TAMANHO_PAGINA
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class RastreioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.voluntario = User.objects.create_user('voluntario')
+        cls.voluntario.perfil.tipo = 'voluntario'
+        cls.voluntario.perfil.save()
+        cls.doador = User.objects.create_user('doador')
+        cls.superusuario = User.objects.create_superuser('root', password='senha')
+        dados_sinteticos.gerar(recebedores=2, doacoes=60, distribuicoes=60, semente=6)
+
+    def test_historico_json_percorre_todas_as_distribuicoes(self):
+        recebedor_id = Distribuicao.objects.values_list('recebedor_id', flat=True).first()
+        url = reverse('historico_recebedor_json', args=[recebedor_id])
+        self.client.force_login(self.voluntario)
+
+        ids, cursor = [], None
+        while True:
+            dados = self.client.get(url, {'cursor': cursor} if cursor else {}).json()
+            self.assertLessEqual(len(dados['resultados']), TAMANHO_PAGINA)
+            ids.extend(r['id'] for r in dados['resultados'])
+            cursor = dados['proximo_cursor']
+            if not cursor:
+                break
+
+        esperados = Distribuicao.objects.filter(recebedor_id=recebedor_id).order_by('-data_distribuicao', '-id')
+        self.assertEqual(ids, list(esperados.values_list('id', flat=True)))
+
+    def test_rastreio_do_doador_percorre_o_que_ele_doou(self):
+        doador_id = Distribuicao.objects.values_list('doacao__doador_id', flat=True).first()
+        url = reverse('rastrear_doador_json', args=[doador_id])
+        self.client.force_login(self.voluntario)
+
+        ids, cursor = [], None
+        while True:
+            dados = self.client.get(url, {'cursor': cursor} if cursor else {}).json()
+            ids.extend(r['id'] for r in dados['resultados'])
+            cursor = dados['proximo_cursor']
+            if not cursor:
+                break
+
+        esperados = Distribuicao.objects.filter(doacao__doador_id=doador_id).order_by('-data_distribuicao', '-id')
+        self.assertEqual(ids, list(esperados.values_list('id', flat=True)))
+
+    def test_doador_nao_ve_historico_de_recebedor(self):
+        self.client.force_login(self.doador)
+        recebedor_id = Distribuicao.objects.values_list('recebedor_id', flat=True).first()
+        resposta = self.client.get(reverse('historico_recebedor', args=[recebedor_id]))
+        self.assertEqual(resposta.status_code, 302)
+
+    def test_doador_nao_busca_recebedores(self):
+        self.client.force_login(self.doador)
+        resposta = self.client.get(reverse('buscar_recebedores'), {'q': '519'})
+        self.assertEqual(resposta.status_code, 302)
+
+        self.client.force_login(self.voluntario)
+        resposta = self.client.get(reverse('buscar_recebedores'), {'q': '519'})
+        self.assertEqual(resposta.status_code, 200)
+
+    def test_changelists_do_admin_sem_n_mais_1(self):
+        self.client.force_login(self.superusuario)
+        for modelo in ('distribuicao', 'doacao'):
+            url = reverse(f'admin:doacoes_{modelo}_changelist')
+            with CaptureQueriesContext(connection) as poucas:
+                self.client.get(url, {'q': 'x'})
+            with CaptureQueriesContext(connection) as muitas:
+                self.client.get(url)
+            with self.subTest(modelo=modelo):
+                self.assertEqual(len(muitas), len(poucas))
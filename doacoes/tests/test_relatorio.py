@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from doacoes.models import Categoria, Distribuicao, Doacao
+from doacoes.utils import dados_sinteticos, relatorio
+
+
+class PaginaRelatorioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        dados_sinteticos.gerar(categorias=3, doacoes=80, distribuicoes=80, semente=9)
+
+    def test_percorre_as_linhas_filtradas_em_ordem(self):
+        cid = Categoria.objects.order_by('id').values_list('id', flat=True).first()
+        filtro_doacao, filtro_distribuicao = relatorio.filtros({'categoria': cid})
+
+        vistas, cursor = [], None
+        while True:
+            linhas, cursor = relatorio.pagina(None, filtro_doacao, filtro_distribuicao, cursor, tamanho=7)
+            vistas.extend((l['tipo'], l['chave']) for l in linhas)
+            if not cursor:
+                break
+
+        esperadas = sorted(
+            [(d.data_criacao, 'pendente', d.id)
+             for d in Doacao.objects.filter(status='pendente', categoria_id=cid)]
+            + [(d.data_distribuicao, 'distribuida', d.id)
+               for d in Distribuicao.objects.filter(doacao__categoria_id=cid)],
+            reverse=True,
+        )
+        self.assertEqual(vistas, [(tipo, chave) for _, tipo, chave in esperadas])
@@ -26,6 +26,14 @@ urlpatterns = [
     path('listar_doacoes/', views.listar_doacoes, name='listar_doacoes'),
     path('cadastrar_recebedor/', views.cadastrar_recebedor, name='cadastrar_recebedor'),
     path('distribuir_por_categoria/', views.distribuir_por_categoria, name='distribuir_por_categoria'),
+    path('buscar_recebedores/', views.buscar_recebedores_json, name='buscar_recebedores'),
+    path('eventos/estoque/', views.eventos_estoque, name='eventos_estoque'),
+    path('recebedores/<int:recebedor_id>/historico/', views.historico_recebedor, name='historico_recebedor'),
+    path('recebedores/<int:recebedor_id>/historico.json', views.historico_recebedor_json, name='historico_recebedor_json'),
+    path('doacoes/<int:doacao_id>/rastreio/', views.rastrear_doacao, name='rastrear_doacao'),
+    path('doacoes/<int:doacao_id>/rastreio.json', views.rastrear_doacao_json, name='rastrear_doacao_json'),
+    path('doadores/<int:doador_id>/rastreio/', views.rastrear_doador, name='rastrear_doador'),
+    path('doadores/<int:doador_id>/rastreio.json', views.rastrear_doador_json, name='rastrear_doador_json'),
 
     # Painel de Administração
     path('painel_admin/', views.admin_dashboard, name='admin_dashboard'),
@@ -55,8 +63,12 @@ urlpatterns = [
     path('painel_admin/locais_entrega/editar/<int:local_id>/', views.admin_editar_local_entrega, name='admin_editar_local_entrega'),
     path('painel_admin/locais_entrega/excluir/<int:local_id>/', views.admin_excluir_local_entrega, name='admin_excluir_local_entrega'),
 
+    # Admin - Importação
+    path('painel_admin/importar/', views.admin_importar_dados, name='admin_importar_dados'),
+
     # Admin - Relatórios
     path('painel_admin/relatorio/', views.admin_relatorio_doacoes, name='admin_relatorio'),
+    path('painel_admin/relatorio/exportar/', views.admin_exportar_relatorio, name='admin_relatorio_exportar'),
 
 
 ]
@@ -0,0 +1,41 @@
+from ..models import Recebedor
+from .documentos import normalizar_documento
+from .texto import normalizar_busca
+
+LIMITE = 20
+
+# Maior caractere possível: [prefixo, prefixo + FIM) cobre todos os valores que
+# começam com o prefixo e vira um intervalo simples no índice B-tree.
+FIM = '\U0010ffff'
+
+
+def filtro_prefixo(campo, prefixo):
+    return {f'{campo}__gte': prefixo, f'{campo}__lt': prefixo + FIM}
+
+
+def buscar_recebedores(termo, limite=LIMITE):
+    """
+    Busca por prefixo de nome, ou de CPF/CNPJ e telefone quando o termo só
+    tem dígitos (e pontuação). Cada ramo é um intervalo num índice e o
+    resultado é limitado a `limite` recebedores.
+    """
+    termo = (termo or '').strip()
+    campos = ('id', 'nome', 'cpf_cnpj', 'telefone')
+    digitos = normalizar_documento(termo)
+
+    if digitos and not any(c.isalpha() for c in termo):
+        if len(digitos) < 3:
+            return []
+        por_documento = Recebedor.objects.filter(**filtro_prefixo('documento', digitos)).values(*campos)
+        por_telefone = Recebedor.objects.filter(**filtro_prefixo('telefone', digitos)).values(*campos)
+        return list(por_documento.union(por_telefone).order_by('nome')[:limite])
+
+    nome = normalizar_busca(termo)
+    if len(nome) < 2:
+        return []
+    return list(
+        Recebedor.objects
+        .filter(**filtro_prefixo('nome_busca', nome))
+        .order_by('nome_busca')
+        .values(*campos)[:limite]
+    )
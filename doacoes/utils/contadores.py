@@ -0,0 +1,53 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Sum
+
+from ..models import Categoria, Distribuicao, LocalEntrega, Recebedor, SaldoEstoque
+
+CHAVE = 'doacoes:painel:contadores'
+
+
+def calcular():
+    pendentes = dict(
+        SaldoEstoque.objects
+        .values_list('categoria_id')
+        .annotate(total=Sum('quantidade'))
+    )
+    distribuidas = dict(
+        Distribuicao.objects
+        .values_list('doacao__categoria_id')
+        .annotate(total=Sum('quantidade_distribuida'))
+    )
+    categorias = list(Categoria.objects.order_by('nome').values_list('id', 'nome'))
+    return {
+        'num_users': User.objects.count(),
+        'num_categories': len(categorias),
+        'num_recebedores': Recebedor.objects.count(),
+        'num_locais_entrega': LocalEntrega.objects.count(),
+        'totais_categoria': [
+            {
+                'nome': nome,
+                'pendente': pendentes.get(cid) or 0,
+                'distribuida': distribuidas.get(cid) or 0,
+            }
+            for cid, nome in categorias
+        ],
+    }
+
+
+def obter():
+    return cache.get_or_set(CHAVE, calcular, settings.CONTADORES_PAINEL_TIMEOUT)
+
+
+async def aobter():
+    valores = await cache.aget(CHAVE)
+    if valores is None:
+        valores = await sync_to_async(calcular)()
+        await cache.aset(CHAVE, valores, settings.CONTADORES_PAINEL_TIMEOUT)
+    return valores
+
+
+def invalidar():
+    cache.delete(CHAVE)
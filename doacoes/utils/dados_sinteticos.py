@@ -0,0 +1,131 @@
+import random
+import secrets
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from ..models import Categoria, Doacao, Distribuicao, LocalEntrega, Perfil, Recebedor
+from . import estoque
+
+TAMANHO_LOTE = 5000
+
+
+def _lotes(total, tamanho):
+    for inicio in range(0, total, tamanho):
+        yield inicio, min(tamanho, total - inicio)
+
+
+def gerar(usuarios=20, categorias=5, locais=3, recebedores=20, doacoes=100,
+          distribuicoes=50, semente=None, prefixo='sint', lote=TAMANHO_LOTE, progresso=None):
+    """
+    Cria um volume sintético de dados com bulk_create, sem passar pelos
+    sinais de criação, e reconstrói o saldo de estoque ao final.
+
+    Doações e distribuições são geradas e gravadas em lotes de `lote`
+    linhas, cada lote na sua transação, então a memória usada não cresce
+    com o total pedido. `semente` fixa os dados, não os nomes, que levam
+    `prefixo` e um rótulo novo a cada execução. `progresso(modelo, criados,
+    total)` é chamada após cada lote. Devolve um dicionário com a quantidade criada de cada modelo.
+    """
+    aleatorio = random.Random(semente)
+    senha = make_password('senha-sintetica')
+    # Fora da semente: a mesma semente gera os mesmos dados, mas cada execução
+    # precisa de nomes novos para não colidir com usuários já gerados.
+    rotulo = f"{prefixo}{secrets.token_hex(3)}"
+    progresso = progresso or (lambda modelo, criados, total: None)
+
+    doadores = []
+    for inicio, tamanho in _lotes(usuarios, lote):
+        with transaction.atomic():
+            novos = User.objects.bulk_create([
+                User(username=f"{rotulo}_u{i}", email=f"{rotulo}_u{i}@exemplo.org", password=senha)
+                for i in range(inicio, inicio + tamanho)
+            ])
+            Perfil.objects.bulk_create([
+                Perfil(usuario=u, tipo='voluntario' if i % 10 == 0 else 'doador', telefone='51999999999')
+                for i, u in enumerate(novos, start=inicio)
+            ])
+        doadores.extend(u.id for i, u in enumerate(novos, start=inicio) if i % 10 != 0)
+        progresso('usuarios', inicio + tamanho, usuarios)
+
+    with transaction.atomic():
+        ids_categorias = [c.id for c in Categoria.objects.bulk_create([
+            Categoria(nome=f"{rotulo} categoria {i}") for i in range(categorias)
+        ])]
+        ids_locais = [l.id for l in LocalEntrega.objects.bulk_create([
+            LocalEntrega(nome=f"{rotulo} local {i}") for i in range(locais)
+        ])]
+
+    ids_recebedores = []
+    for inicio, tamanho in _lotes(recebedores, lote):
+        novos = [
+            Recebedor(
+                nome=f"{rotulo} recebedor {i}",
+                cpf_cnpj=f"{aleatorio.randrange(10 ** 11):011d}",
+                endereco=f"Rua {i}, {rotulo}",
+                telefone='51999999999'
+            )
+            for i in range(inicio, inicio + tamanho)
+        ]
+        for r in novos:
+            r.normalizar()
+        ids_recebedores.extend(r.id for r in Recebedor.objects.bulk_create(novos))
+        progresso('recebedores', inicio + tamanho, recebedores)
+
+    total_doacoes = 0
+    total_distribuicoes = 0
+    if doadores and ids_categorias and ids_locais:
+        for inicio, tamanho in _lotes(doacoes, lote):
+            novas = []
+            for i in range(inicio, inicio + tamanho):
+                qtd = aleatorio.randint(1, 20)
+                novas.append(Doacao(
+                    categoria_id=aleatorio.choice(ids_categorias),
+                    local_entrega_id=aleatorio.choice(ids_locais),
+                    doador_id=aleatorio.choice(doadores),
+                    descricao=f"Doação sintética {i}",
+                    quantidade=qtd,
+                    quantidade_inicial=qtd,
+                ))
+
+            # Distribuições proporcionais ao tamanho do lote, consumindo só as
+            # doações do próprio lote antes de gravá-las, sem bulk_update.
+            cota = (distribuicoes * (inicio + tamanho)) // doacoes - total_distribuicoes
+            novas_distribuicoes = []
+            if ids_recebedores:
+                for _ in range(cota):
+                    d = aleatorio.choice(novas)
+                    if d.quantidade == 0:
+                        continue
+                    usar = aleatorio.randint(1, d.quantidade)
+                    novas_distribuicoes.append((d, usar))
+                    d.quantidade -= usar
+                    if d.quantidade == 0:
+                        d.status = 'distribuida'
+
+            with transaction.atomic():
+                Doacao.objects.bulk_create(novas)
+                Distribuicao.objects.bulk_create([
+                    Distribuicao(
+                        doacao=d,
+                        recebedor_id=aleatorio.choice(ids_recebedores),
+                        quantidade_distribuida=usar
+                    )
+                    for d, usar in novas_distribuicoes
+                ])
+
+            total_doacoes += len(novas)
+            total_distribuicoes += len(novas_distribuicoes)
+            progresso('doacoes', total_doacoes, doacoes)
+
+    estoque.reconstruir()
+
+    return {
+        'usuarios': usuarios,
+        'categorias': len(ids_categorias),
+        'locais': len(ids_locais),
+        'recebedores': len(ids_recebedores),
+        'doacoes': total_doacoes,
+        'distribuicoes': total_distribuicoes,
+    }
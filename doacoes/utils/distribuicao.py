@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When, Window
+
+from ..models import Doacao, Distribuicao
+from . import estoque
+
+
+class EstoqueInsuficiente(Exception):
+    def __init__(self, categoria_id, solicitado, disponivel):
+        self.categoria_id = categoria_id
+        self.solicitado = solicitado
+        self.disponivel = disponivel
+        super().__init__(
+            f"Estoque insuficiente na categoria {categoria_id}: "
+            f"solicitado {solicitado}, disponível {disponivel}."
+        )
+
+
+def distribuir(recebedor, quantidades):
+    """
+    Distribui para `recebedor` as quantidades pedidas por categoria
+    ({categoria_id: quantidade}), consumindo as doações pendentes mais
+    antigas primeiro (FIFO).
+
+    Só as doações necessárias para cobrir o pedido são bloqueadas, a divisão
+    é calculada em memória e a escrita é feita com um bulk_create e um
+    bulk_update dentro de uma única transação, então o custo em consultas
+    não depende de quantas doações estão pendentes nem de quantas são
+    esgotadas.
+    """
+    pedidos = {cid: qtd for cid, qtd in quantidades.items() if qtd and qtd > 0}
+    if not pedidos:
+        return []
+
+    with transaction.atomic():
+        por_categoria = _bloquear_necessarias(pedidos)
+
+        distribuicoes = []
+        alteradas = []
+        for cid, quantidade in pedidos.items():
+            fila = por_categoria.get(cid, [])
+            disponivel = sum(d.quantidade for d in fila)
+            if quantidade > disponivel:
+                raise EstoqueInsuficiente(cid, quantidade, disponivel)
+
+            restante = quantidade
+            for d in fila:
+                usar = min(restante, d.quantidade)
+                distribuicoes.append(Distribuicao(
+                    doacao=d,
+                    recebedor=recebedor,
+                    quantidade_distribuida=usar
+                ))
+                d.quantidade -= usar
+                if d.quantidade == 0:
+                    d.status = 'distribuida'
+                alteradas.append(d)
+                restante -= usar
+                if restante <= 0:
+                    break
+
+        Distribuicao.objects.bulk_create(distribuicoes)
+        Doacao.objects.bulk_update(alteradas, ['quantidade', 'status'])
+        estoque.saida(distribuicoes)
+
+    return distribuicoes
+
+
+def _necessarias(pedidos):
+    """
+    Ids das doações pendentes, em ordem FIFO, cujo acumulado anterior ainda
+    não cobre o pedido da categoria: a última linha devolvida é a que fecha o
+    pedido, e nenhuma além dela é lida ou bloqueada.
+    """
+    ordem = [F('data_criacao').asc(), F('id').asc()]
+    return (
+        Doacao.objects
+        .filter(categoria_id__in=pedidos, status='pendente', quantidade__gt=0)
+        .annotate(
+            anterior=Window(Sum('quantidade'), partition_by=[F('categoria_id')], order_by=ordem)
+            - F('quantidade'),
+            pedido=Case(
+                *[When(categoria_id=cid, then=Value(qtd)) for cid, qtd in pedidos.items()],
+                output_field=IntegerField(),
+            ),
+        )
+        .filter(anterior__lt=F('pedido'))
+        .values('id')
+    )
+
+
+def consulta_bloqueio(pedidos):
+    """A consulta, sobre `_necessarias`, que lê e bloqueia as doações de `pedidos`."""
+    return (
+        Doacao.objects
+        .select_for_update()
+        .filter(id__in=_necessarias(pedidos), status='pendente', quantidade__gt=0)
+        .order_by('categoria_id', 'data_criacao', 'id')
+        .only('id', 'categoria_id', 'local_entrega_id', 'quantidade', 'status')
+    )
+
+
+def _bloquear_necessarias(pedidos):
+    """
+    Bloqueia as doações escolhidas por `_necessarias` e as agrupa por
+    categoria. Se uma distribuição concorrente consumiu alguma delas antes do
+    bloqueio, a escolha é refeita; quando ela se repete sem cobrir o pedido,
+    o estoque é de fato insuficiente.
+    """
+    vistas = None
+    while True:
+        por_categoria = {}
+        for d in consulta_bloqueio(pedidos):
+            por_categoria.setdefault(d.categoria_id, []).append(d)
+
+        ids = {d.id for fila in por_categoria.values() for d in fila}
+        cobertas = all(
+            sum(d.quantidade for d in por_categoria.get(cid, [])) >= qtd
+            for cid, qtd in pedidos.items()
+        )
+        if cobertas or ids == vistas:
+            return por_categoria
+        vistas = ids
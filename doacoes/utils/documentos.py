@@ -0,0 +1,65 @@
+import re
+from functools import lru_cache
+
+_NAO_DIGITOS = re.compile(r'[^0-9]')
+_CPF = re.compile(r'[0-9]{11}')
+_CNPJ = re.compile(r'[0-9]{14}')
+
+_PESOS_CNPJ_1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+_PESOS_CNPJ_2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+
+CPF_INVALIDO = 'CPF inválido.'
+CNPJ_INVALIDO = 'CNPJ inválido.'
+TAMANHO_INVALIDO = 'Informe um CPF (11 dígitos) ou CNPJ (14 dígitos) válido.'
+
+
+def somente_digitos(valor):
+    # [^0-9] e não \D: dígitos não ASCII não são dígitos de documento nem de telefone.
+    return _NAO_DIGITOS.sub('', valor or '')
+
+
+normalizar_documento = somente_digitos
+
+
+def _digito(numeros, pesos):
+    resto = sum(n * p for n, p in zip(numeros, pesos)) % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def cpf_valido(digitos):
+    if not _CPF.fullmatch(digitos) or digitos == digitos[0] * 11:
+        return False
+    numeros = [int(c) for c in digitos]
+    return (
+        _digito(numeros[:9], range(10, 1, -1)) == numeros[9]
+        and _digito(numeros[:10], range(11, 1, -1)) == numeros[10]
+    )
+
+
+def cnpj_valido(digitos):
+    if not _CNPJ.fullmatch(digitos) or digitos == digitos[0] * 14:
+        return False
+    numeros = [int(c) for c in digitos]
+    return (
+        _digito(numeros[:12], _PESOS_CNPJ_1) == numeros[12]
+        and _digito(numeros[:13], _PESOS_CNPJ_2) == numeros[13]
+    )
+
+
+@lru_cache(maxsize=4096)
+def validar(valor):
+    """
+    Normaliza e valida um CPF ou CNPJ. Devolve (dígitos, erro), com `erro`
+    None quando o documento é válido. Os resultados recentes ficam em cache.
+    """
+    digitos = normalizar_documento(valor)
+    if len(digitos) == 11:
+        return digitos, None if cpf_valido(digitos) else CPF_INVALIDO
+    if len(digitos) == 14:
+        return digitos, None if cnpj_valido(digitos) else CNPJ_INVALIDO
+    return digitos, TAMANHO_INVALIDO
+
+
+def validar_lote(valores):
+    """Valida uma sequência de documentos, devolvendo a lista de (dígitos, erro)."""
+    return [validar(v) for v in valores]
@@ -0,0 +1,39 @@
+from django.db.models import Count
+
+from ..models import Perfil, Recebedor
+from .documentos import normalizar_documento
+
+
+def recebedores_com_documento(cpf_cnpj, excluir_pk=None):
+    """Recebedores já cadastrados com o mesmo documento, pelo índice de `documento`."""
+    documento = normalizar_documento(cpf_cnpj)
+    if not documento:
+        return Recebedor.objects.none()
+    qs = Recebedor.objects.filter(documento=documento)
+    if excluir_pk:
+        qs = qs.exclude(pk=excluir_pk)
+    return qs
+
+
+def grupos_duplicados(modelo=Recebedor):
+    """Documentos que aparecem em mais de um registro de `modelo`, com os ids envolvidos."""
+    repetidos = (
+        modelo.objects
+        .exclude(documento='')
+        .values('documento')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('documento', flat=True)
+    )
+    grupos = {}
+    for documento, pk in (
+        modelo.objects
+        .filter(documento__in=repetidos)
+        .order_by('documento', 'id')
+        .values_list('documento', 'id')
+    ):
+        grupos.setdefault(documento, []).append(pk)
+    return grupos
+
+
+MODELOS = {'recebedores': Recebedor, 'perfis': Perfil}
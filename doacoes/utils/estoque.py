@@ -0,0 +1,107 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+from ..models import Doacao, SaldoEstoque
+from . import contadores, eventos
+
+CHAVE_VERSAO = 'doacoes:estoque:versao'
+
+
+def versao():
+    """
+    Instante, em nanossegundos, da última mudança de estoque conhecida. Serve
+    de ETag/Last-Modified e de chave para o que é renderizado a partir do
+    saldo; sem valor no cache, começa uma versão nova.
+    """
+    return cache.get_or_set(CHAVE_VERSAO, time.time_ns, settings.CACHE_ESTOQUE_TIMEOUT)
+
+
+def renovar_versao():
+    cache.set(CHAVE_VERSAO, time.time_ns(), settings.CACHE_ESTOQUE_TIMEOUT)
+
+
+def movimentar(deltas):
+    """
+    Aplica ao saldo as variações {(categoria_id, local_entrega_id): delta}.
+    Deve ser chamada dentro da mesma transação que grava as doações ou
+    distribuições que originaram o movimento.
+    """
+    deltas = {chave: delta for chave, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        SaldoEstoque.objects.bulk_create(
+            [SaldoEstoque(categoria_id=cid, local_entrega_id=lid) for cid, lid in deltas],
+            ignore_conflicts=True,
+        )
+        filtro = Q()
+        for cid, lid in deltas:
+            filtro |= Q(categoria_id=cid, local_entrega_id=lid)
+        saldos = list(SaldoEstoque.objects.select_for_update().filter(filtro))
+        novos = {}
+        for saldo in saldos:
+            chave = (saldo.categoria_id, saldo.local_entrega_id)
+            # Linhas bloqueadas: o valor lido mais o delta é o saldo gravado.
+            novos[chave] = saldo.quantidade + deltas[chave]
+            saldo.quantidade = F('quantidade') + deltas[chave]
+        SaldoEstoque.objects.bulk_update(saldos, ['quantidade'])
+        transaction.on_commit(contadores.invalidar)
+        transaction.on_commit(renovar_versao)
+        transaction.on_commit(lambda: eventos.publicar_saldos(novos))
+
+
+def entrada(doacoes):
+    deltas = defaultdict(int)
+    for d in doacoes:
+        deltas[(d.categoria_id, d.local_entrega_id)] += d.quantidade
+    movimentar(deltas)
+
+
+def saida(distribuicoes):
+    deltas = defaultdict(int)
+    for dist in distribuicoes:
+        d = dist.doacao
+        deltas[(d.categoria_id, d.local_entrega_id)] -= dist.quantidade_distribuida
+    movimentar(deltas)
+
+
+def calcular_saldos():
+    linhas = (
+        Doacao.objects
+        .filter(status='pendente')
+        .values('categoria_id', 'local_entrega_id')
+        .annotate(total=Sum('quantidade'))
+    )
+    return {(l['categoria_id'], l['local_entrega_id']): l['total'] or 0 for l in linhas}
+
+
+def divergencias():
+    esperado = calcular_saldos()
+    atual = {
+        (s.categoria_id, s.local_entrega_id): s.quantidade
+        for s in SaldoEstoque.objects.all()
+    }
+    return {
+        chave: (atual.get(chave, 0), esperado.get(chave, 0))
+        for chave in esperado.keys() | atual.keys()
+        if atual.get(chave, 0) != esperado.get(chave, 0)
+    }
+
+
+def reconstruir():
+    with transaction.atomic():
+        SaldoEstoque.objects.all().delete()
+        saldos = calcular_saldos()
+        SaldoEstoque.objects.bulk_create([
+            SaldoEstoque(categoria_id=cid, local_entrega_id=lid, quantidade=qtd)
+            for (cid, lid), qtd in saldos.items()
+        ])
+        transaction.on_commit(contadores.invalidar)
+        transaction.on_commit(renovar_versao)
+    return len(saldos)
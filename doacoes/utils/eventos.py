@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+TAMANHO_FILA = 100
+
+
+class Assinatura:
+    def __init__(self, broker, loop, fila):
+        self._broker = broker
+        self.loop = loop
+        self.fila = fila
+
+    async def proximo(self, timeout=None):
+        """Próximo evento; levanta TimeoutError se nada chegar em `timeout` s."""
+        return await asyncio.wait_for(self.fila.get(), timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._broker.cancelar(self)
+
+
+class BrokerLocal:
+    """
+    Pub/sub dentro do processo. `publicar` pode ser chamado de qualquer
+    thread (normalmente num on_commit); cada evento é entregue na fila de
+    cada assinante pelo event loop dele. Só alcança assinantes do mesmo
+    processo: com vários workers, troque EVENTOS_BROKER por uma
+    implementação com a mesma interface sobre um serviço compartilhado.
+    """
+
+    def __init__(self):
+        self._assinaturas = set()
+        self._trava = threading.Lock()
+
+    def assinar(self):
+        assinatura = Assinatura(self, asyncio.get_running_loop(), asyncio.Queue(TAMANHO_FILA))
+        with self._trava:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._trava:
+            self._assinaturas.discard(assinatura)
+
+    def publicar(self, eventos):
+        with self._trava:
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            try:
+                assinatura.loop.call_soon_threadsafe(_entregar, assinatura.fila, eventos)
+            except RuntimeError:
+                # Loop já encerrado; a assinatura some quando a conexão fecha.
+                pass
+
+
+def _entregar(fila, eventos):
+    for evento in eventos:
+        try:
+            fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Cliente lento perde eventos antigos; o próximo saldo o corrige.
+            fila.get_nowait()
+            fila.put_nowait(evento)
+
+
+@cache
+def broker():
+    return import_string(settings.EVENTOS_BROKER)()
+
+
+def publicar_saldos(saldos):
+    """Publica {(categoria_id, local_entrega_id): saldo} como eventos de estoque."""
+    broker().publicar([
+        {'categoria': cid, 'local_entrega': lid, 'saldo': quantidade}
+        for (cid, lid), quantidade in saldos.items()
+    ])
@@ -0,0 +1,32 @@
+from django.db.models import Count, Sum
+
+from ..models import Doacao
+from .paginacao import apos_cursor, fatiar
+
+TAMANHO_PAGINA = 20
+
+
+def pendentes_por_categoria():
+    """Doações e unidades pendentes de cada categoria, numa única agregação."""
+    return list(
+        Doacao.objects
+        .filter(status='pendente')
+        .values('categoria_id', 'categoria__nome')
+        .annotate(doacoes=Count('id'), unidades=Sum('quantidade'))
+        .order_by('categoria__nome')
+    )
+
+
+def pagina(cursor=None, tamanho=TAMANHO_PAGINA):
+    """
+    Devolve (doacoes, proximo_cursor) com as doações pendentes mais antigas
+    primeiro, paginadas por (data_criacao, id) sobre o índice de status e
+    data, com categoria, local e doador carregados na mesma consulta.
+    """
+    qs = apos_cursor(
+        Doacao.objects
+        .filter(status='pendente')
+        .select_related('categoria', 'local_entrega', 'doador'),
+        'data_criacao', cursor
+    )
+    return fatiar(list(qs[:tamanho + 1]), tamanho, 'data_criacao')
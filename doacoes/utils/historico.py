@@ -0,0 +1,69 @@
+from django.db.models import F, Sum
+
+from ..models import Distribuicao, Doacao
+from .paginacao import apos_cursor
+
+TAMANHO_PAGINA = 20
+
+
+def totais_do_doador(doador):
+    """Quanto `doador` doou, quanto já foi entregue e quanto resta, por categoria."""
+    return (
+        Doacao.objects
+        .filter(doador=doador)
+        .values('categoria__nome')
+        .annotate(
+            doado=Sum('quantidade_inicial'),
+            restante=Sum('quantidade'),
+            entregue=Sum(F('quantidade_inicial') - F('quantidade')),
+        )
+        .order_by('categoria__nome')
+    )
+
+
+def doacoes_do_doador(doador, cursor=None, tamanho=TAMANHO_PAGINA):
+    """
+    Consulta de uma página das doações de `doador`, das mais recentes para as
+    antigas, sobre o índice (doador, data_criacao). Traz `tamanho + 1`
+    linhas para `fatiar` saber se há próxima página.
+    """
+    return apos_cursor(
+        Doacao.objects.filter(doador=doador).select_related('categoria', 'local_entrega'),
+        'data_criacao', cursor, decrescente=True
+    )[:tamanho + 1]
+
+
+def _distribuicoes(cursor, tamanho, **filtro):
+    return apos_cursor(
+        Distribuicao.objects
+        .filter(**filtro)
+        .select_related('doacao__categoria', 'doacao__local_entrega', 'recebedor'),
+        'data_distribuicao', cursor, decrescente=True
+    )[:tamanho + 1]
+
+
+def distribuicoes_do_recebedor(recebedor_id, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Página do que `recebedor_id` recebeu, do mais recente ao mais antigo."""
+    return _distribuicoes(cursor, tamanho, recebedor_id=recebedor_id)
+
+
+def distribuicoes_da_doacao(doacao_id, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Página de para quem foi cada parte de `doacao_id`."""
+    return _distribuicoes(cursor, tamanho, doacao_id=doacao_id)
+
+
+def distribuicoes_do_doador(doador_id, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Página de quem recebeu o que `doador_id` doou, do mais recente ao mais antigo."""
+    return _distribuicoes(cursor, tamanho, doacao__doador_id=doador_id)
+
+
+def distribuicao_como_dict(d):
+    return {
+        'id': d.id,
+        'data': d.data_distribuicao.isoformat(),
+        'quantidade': d.quantidade_distribuida,
+        'doacao': d.doacao_id,
+        'categoria': d.doacao.categoria.nome,
+        'local_entrega': d.doacao.local_entrega.nome,
+        'recebedor': {'id': d.recebedor_id, 'nome': d.recebedor.nome},
+    }
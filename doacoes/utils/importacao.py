@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from ..models import Categoria, Doacao, LocalEntrega, Perfil, Recebedor
+from . import contadores, estoque
+from .validacao import limpar_cpf_cnpj, limpar_telefone
+
+TAMANHO_LOTE = 1000
+
+FORMATOS = ('csv', 'json', 'jsonl')
+
+
+class Resultado:
+    def __init__(self):
+        self.importados = 0
+        self.rejeitados = []
+
+    def rejeitar(self, linha, erro):
+        self.rejeitados.append((linha, erro))
+
+
+def formato_do_arquivo(nome):
+    extensao = nome.rsplit('.', 1)[-1].lower() if '.' in nome else ''
+    return extensao if extensao in FORMATOS else None
+
+
+def ler_registros(arquivo, formato):
+    """
+    Percorre os registros de um arquivo binário sem carregá-lo inteiro,
+    devolvendo pares (número da linha, dicionário). Para 'json' o arquivo é
+    um array e precisa ser lido de uma vez; prefira 'jsonl' para arquivos
+    grandes.
+    """
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    if formato == 'csv':
+        leitor = csv.DictReader(texto)
+        for registro in leitor:
+            yield leitor.line_num, registro
+    elif formato == 'jsonl':
+        for numero, linha in enumerate(texto, start=1):
+            if linha.strip():
+                try:
+                    yield numero, json.loads(linha)
+                except ValueError:
+                    yield numero, None
+    elif formato == 'json':
+        for numero, registro in enumerate(json.load(texto), start=1):
+            yield numero, registro
+    else:
+        raise ValueError(f"Formato não suportado: {formato}")
+    texto.detach()
+
+
+def _texto(registro, campo, obrigatorio=True, maximo=None):
+    if not isinstance(registro, dict):
+        raise ValidationError("Registro inválido.")
+    valor = str(registro.get(campo) or '').strip()
+    if obrigatorio and not valor:
+        raise ValidationError(f"Campo obrigatório: {campo}.")
+    if maximo and len(valor) > maximo:
+        raise ValidationError(f"Campo {campo} excede {maximo} caracteres.")
+    return valor
+
+
+def _valores(itens, campo):
+    return {str(r.get(campo) or '').strip() for _, r in itens if isinstance(r, dict)}
+
+
+def _em_lotes(registros, tamanho):
+    lote = []
+    for item in registros:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _mensagem(erro):
+    return ' '.join(erro.messages)
+
+
+def _recebedor(registro):
+    recebedor = Recebedor(
+        nome=_texto(registro, 'nome', maximo=100),
+        cpf_cnpj=limpar_cpf_cnpj(_texto(registro, 'cpf_cnpj')),
+        endereco=_texto(registro, 'endereco'),
+        telefone=limpar_telefone(_texto(registro, 'telefone', obrigatorio=False)),
+    )
+    recebedor.normalizar()
+    return recebedor
+
+
+def importar_recebedores(registros, resultado, lote):
+    for itens in _em_lotes(registros, lote):
+        candidatos = []
+        for linha, registro in itens:
+            try:
+                candidatos.append((linha, _recebedor(registro)))
+            except ValidationError as erro:
+                resultado.rejeitar(linha, _mensagem(erro))
+
+        vistos = set(
+            Recebedor.objects
+            .filter(documento__in=[r.documento for _, r in candidatos])
+            .values_list('documento', flat=True)
+        )
+        validos = []
+        for linha, recebedor in candidatos:
+            if recebedor.documento in vistos:
+                resultado.rejeitar(linha, 'Já existe um recebedor cadastrado com este CPF/CNPJ.')
+                continue
+            vistos.add(recebedor.documento)
+            validos.append(recebedor)
+        Recebedor.objects.bulk_create(validos)
+        # bulk_create não dispara os sinais que invalidam o painel.
+        transaction.on_commit(contadores.invalidar)
+        resultado.importados += len(validos)
+
+
+def importar_doacoes(registros, resultado, lote):
+    categorias = {c.nome.lower(): c for c in Categoria.objects.all()}
+    locais = {l.nome.lower(): l for l in LocalEntrega.objects.all()}
+
+    for itens in _em_lotes(registros, lote):
+        doadores = User.objects.only('id', 'username').in_bulk(
+            _valores(itens, 'doador'), field_name='username'
+        )
+        validas = []
+        for linha, registro in itens:
+            try:
+                categoria = categorias.get(_texto(registro, 'categoria').lower())
+                local = locais.get(_texto(registro, 'local_entrega').lower())
+                doador = doadores.get(_texto(registro, 'doador'))
+                if not categoria:
+                    raise ValidationError("Categoria inexistente.")
+                if not local:
+                    raise ValidationError("Local de entrega inexistente.")
+                if not doador:
+                    raise ValidationError("Doador inexistente.")
+                try:
+                    quantidade = int(_texto(registro, 'quantidade'))
+                except (TypeError, ValueError):
+                    raise ValidationError("Quantidade inválida.")
+                if quantidade <= 0:
+                    raise ValidationError("Quantidade deve ser positiva.")
+            except ValidationError as erro:
+                resultado.rejeitar(linha, _mensagem(erro))
+                continue
+            validas.append(Doacao(
+                categoria=categoria,
+                local_entrega=local,
+                doador=doador,
+                quantidade=quantidade,
+                quantidade_inicial=quantidade,
+                descricao=_texto(registro, 'descricao', obrigatorio=False)[:200]
+                    or f"Doação de {quantidade} {categoria.nome.lower()}",
+            ))
+        with transaction.atomic():
+            Doacao.objects.bulk_create(validas)
+            estoque.entrada(validas)
+        resultado.importados += len(validas)
+
+
+def _perfil(registro):
+    tipo = _texto(registro, 'tipo', obrigatorio=False) or 'doador'
+    if tipo not in ('doador', 'voluntario'):
+        raise ValidationError("Tipo deve ser 'doador' ou 'voluntario'.")
+    cpf_cnpj = _texto(registro, 'cpf_cnpj', obrigatorio=False)
+    telefone = _texto(registro, 'telefone', obrigatorio=False)
+    nascimento = _texto(registro, 'data_nascimento_fundacao', obrigatorio=False)
+    try:
+        nascimento = date.fromisoformat(nascimento) if nascimento else None
+    except ValueError:
+        raise ValidationError("Data de nascimento/fundação inválida (use AAAA-MM-DD).")
+    cpf_cnpj = limpar_cpf_cnpj(cpf_cnpj) if cpf_cnpj else None
+    return Perfil(
+        tipo=tipo,
+        cpf_cnpj=cpf_cnpj,
+        documento=cpf_cnpj or '',
+        telefone=limpar_telefone(telefone) if telefone else None,
+        endereco=_texto(registro, 'endereco', obrigatorio=False) or None,
+        data_nascimento_fundacao=nascimento,
+    )
+
+
+def importar_usuarios(registros, resultado, lote):
+    # Sem senha utilizável: gerar um hash por linha tornaria a importação
+    # ordens de grandeza mais lenta. A senha é definida depois pelo admin.
+    senha = make_password(None)
+    for itens in _em_lotes(registros, lote):
+        existentes = set(
+            User.objects.filter(username__in=_valores(itens, 'username')).values_list('username', flat=True)
+        )
+        pares = []
+        for linha, registro in itens:
+            try:
+                username = _texto(registro, 'username', maximo=150)
+                if username in existentes:
+                    raise ValidationError("Usuário já existe.")
+                perfil = _perfil(registro)
+                email = _texto(registro, 'email', obrigatorio=False, maximo=254)
+            except ValidationError as erro:
+                resultado.rejeitar(linha, _mensagem(erro))
+                continue
+            existentes.add(username)
+            # Como em registrar_usuario, voluntários aguardam aprovação do admin.
+            pares.append((
+                User(username=username, email=email, password=senha,
+                     is_active=perfil.tipo != 'voluntario'),
+                perfil
+            ))
+        with transaction.atomic():
+            usuarios = User.objects.bulk_create([u for u, _ in pares])
+            for usuario, (_, perfil) in zip(usuarios, pares):
+                perfil.usuario = usuario
+            Perfil.objects.bulk_create([p for _, p in pares])
+            transaction.on_commit(contadores.invalidar)
+        resultado.importados += len(pares)
+
+
+IMPORTADORES = {
+    'recebedores': importar_recebedores,
+    'doacoes': importar_doacoes,
+    'usuarios': importar_usuarios,
+}
+
+
+def importar(tipo, arquivo, formato, lote=TAMANHO_LOTE):
+    resultado = Resultado()
+    IMPORTADORES[tipo](ler_registros(arquivo, formato), resultado, lote)
+    return resultado
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+TAMANHO_PAGINA = 25
+
+
+def codificar_cursor(*valores):
+    bruto = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in valores])
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, tipos):
+    """
+    Devolve a tupla de valores do cursor convertidos conforme `tipos`
+    (datetime, str, int...), ou None se o cursor estiver ausente ou inválido.
+    """
+    if not cursor:
+        return None
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valores = json.loads(bruto)
+        if len(valores) != len(tipos):
+            return None
+        return tuple(
+            datetime.fromisoformat(v) if tipo is datetime else tipo(v)
+            for tipo, v in zip(tipos, valores)
+        )
+    except (ValueError, TypeError):
+        return None
+
+
+def paginar(params, queryset, ordenacoes, tamanho=TAMANHO_PAGINA):
+    """
+    Ordena `queryset` pela opção `ordem` de `params`, restrita às chaves de
+    `ordenacoes` (a primeira é o padrão), e devolve (página, ordem) com a
+    página indicada em `pagina`.
+    """
+    ordem = params.get('ordem')
+    if ordem not in ordenacoes:
+        ordem = next(iter(ordenacoes))
+    paginador = Paginator(queryset.order_by(*ordenacoes[ordem]), tamanho)
+    return paginador.get_page(params.get('pagina')), ordem
+
+
+def apos_cursor(queryset, campo, cursor, decrescente=False):
+    """
+    Ordena `queryset` por (campo, id) e, havendo cursor, mantém só o que vem
+    depois dele. Ler `tamanho + 1` itens e passar a `fatiar` dá a página.
+    """
+    sinal, comparacao = ('-', 'lt') if decrescente else ('', 'gt')
+    queryset = queryset.order_by(f'{sinal}{campo}', f'{sinal}id')
+    valores = decodificar_cursor(cursor, (datetime, int))
+    if valores:
+        valor, chave = valores
+        queryset = queryset.filter(
+            Q(**{f'{campo}__{comparacao}': valor}) | Q(**{campo: valor, f'id__{comparacao}': chave})
+        )
+    return queryset
+
+
+def fatiar(itens, tamanho, campo):
+    """Devolve (página, próximo cursor) a partir de até `tamanho + 1` itens."""
+    if len(itens) <= tamanho:
+        return itens, None
+    itens = itens[:tamanho]
+    return itens, codificar_cursor(getattr(itens[-1], campo), itens[-1].id)
@@ -0,0 +1,33 @@
+from django.db import transaction
+
+from ..models import Doacao
+from . import estoque
+
+
+def registrar_doacoes(doador, local_entrega, quantidades, descricao=''):
+    """
+    Registra de uma só vez as doações de `doador` em `local_entrega`, uma por
+    categoria de `quantidades` ({categoria: quantidade}) com valor positivo.
+
+    As linhas são inseridas com um único bulk_create; como ele não passa por
+    Doacao.save(), quantidade_inicial é preenchida aqui.
+    """
+    novas = [
+        Doacao(
+            categoria=cat,
+            quantidade=qtd,
+            quantidade_inicial=qtd,
+            local_entrega=local_entrega,
+            descricao=descricao or f"Doação de {qtd} {cat.nome.lower()}",
+            doador=doador
+        )
+        for cat, qtd in quantidades.items()
+        if qtd and qtd > 0
+    ]
+    if not novas:
+        return []
+
+    with transaction.atomic():
+        Doacao.objects.bulk_create(novas)
+        estoque.entrada(novas)
+    return novas
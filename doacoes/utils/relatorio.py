@@ -0,0 +1,175 @@
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.db.models import CharField, F, Q, Sum, Value
+
+from ..models import Doacao, Distribuicao
+from .paginacao import codificar_cursor, decodificar_cursor
+
+TAMANHO_PAGINA = 50
+
+
+def filtros(params):
+    cid = params.get('categoria')
+    lid = params.get('local_entrega')
+
+    filtro_doacao = {}
+    filtro_distribuicao = {}
+
+    if cid:
+        filtro_doacao['categoria_id'] = cid
+        filtro_distribuicao['doacao__categoria_id'] = cid
+
+    if lid:
+        filtro_doacao['local_entrega_id'] = lid
+        filtro_distribuicao['doacao__local_entrega_id'] = lid
+
+    return filtro_doacao, filtro_distribuicao
+
+
+def pendentes(filtro_doacao):
+    return Doacao.objects.filter(status='pendente', **filtro_doacao)
+
+
+def distribuicoes(filtro_distribuicao):
+    return Distribuicao.objects.filter(**filtro_distribuicao)
+
+
+def _linhas_pendentes(qs):
+    return qs.values(
+        tipo=Value('pendente', output_field=CharField()),
+        chave=F('id'),
+        data=F('data_criacao'),
+        cat_id=F('categoria_id'),
+        local_id=F('local_entrega_id'),
+        doador_ref=F('doador_id'),
+        qtd=F('quantidade'),
+    )
+
+
+def _linhas_distribuidas(qs):
+    return qs.values(
+        tipo=Value('distribuida', output_field=CharField()),
+        chave=F('id'),
+        data=F('data_distribuicao'),
+        cat_id=F('doacao__categoria_id'),
+        local_id=F('doacao__local_entrega_id'),
+        doador_ref=F('doacao__doador_id'),
+        qtd=F('quantidade_distribuida'),
+    )
+
+
+def _apos_cursor(tipo, campo_data, cursor):
+    # Ordem decrescente por (data, tipo, chave); `tipo` é constante em cada ramo.
+    data, tipo_cursor, chave = cursor
+    mesmo_instante = Q(**{campo_data: data})
+    if tipo < tipo_cursor:
+        mesmo_instante_depois = mesmo_instante
+    elif tipo == tipo_cursor:
+        mesmo_instante_depois = mesmo_instante & Q(id__lt=chave)
+    else:
+        mesmo_instante_depois = Q(pk__in=[])
+    return Q(**{f'{campo_data}__lt': data}) | mesmo_instante_depois
+
+
+def _primeiras(qs, campo_data, tamanho):
+    # Cada ramo chega à UNION já ordenado e cortado, para que um ramo
+    # filtrado por categoria ou local não ordene todo o seu histórico a cada
+    # página. O corte vai numa subconsulta de ids porque o SQLite não aceita
+    # LIMIT nos ramos de uma UNION.
+    return qs.model.objects.filter(
+        pk__in=qs.order_by(f'-{campo_data}', '-id').values('pk')[:tamanho]
+    )
+
+
+def consulta_pagina(status, filtro_doacao, filtro_distribuicao, cursor=None, tamanho=TAMANHO_PAGINA):
+    """
+    A UNION de uma página do relatório, do registro mais recente para o mais
+    antigo, com `tamanho + 1` linhas para saber se há próxima página.
+    `cursor` é a tupla já decodificada (data, tipo, chave).
+    """
+    ramos = []
+    if status != 'distribuida':
+        qs = pendentes(filtro_doacao)
+        if cursor:
+            qs = qs.filter(_apos_cursor('pendente', 'data_criacao', cursor))
+        ramos.append(_linhas_pendentes(_primeiras(qs, 'data_criacao', tamanho + 1)))
+    if status != 'pendente':
+        qs = distribuicoes(filtro_distribuicao)
+        if cursor:
+            qs = qs.filter(_apos_cursor('distribuida', 'data_distribuicao', cursor))
+        ramos.append(_linhas_distribuidas(_primeiras(qs, 'data_distribuicao', tamanho + 1)))
+
+    consulta = ramos[0].union(*ramos[1:], all=True) if len(ramos) > 1 else ramos[0]
+    return consulta.order_by('-data', '-tipo', '-chave')[:tamanho + 1]
+
+
+def pagina(status, filtro_doacao, filtro_distribuicao, cursor=None, tamanho=TAMANHO_PAGINA):
+    """
+    Devolve (linhas, proximo_cursor) de uma página do relatório, numa única
+    consulta UNION ordenada do registro mais recente para o mais antigo.
+    """
+    cursor = decodificar_cursor(cursor, (datetime, str, int))
+    linhas = list(consulta_pagina(status, filtro_doacao, filtro_distribuicao, cursor, tamanho))
+
+    proximo = None
+    if len(linhas) > tamanho:
+        linhas = linhas[:tamanho]
+        ultima = linhas[-1]
+        proximo = codificar_cursor(ultima['data'], ultima['tipo'], ultima['chave'])
+    return linhas, proximo
+
+
+def linhas_exportacao(status, filtro_doacao, filtro_distribuicao):
+    """
+    Mesma UNION de `pagina`, sem cursor e já com os nomes relacionados,
+    para ser percorrida com .iterator() na exportação.
+    """
+    ramos = []
+    if status != 'distribuida':
+        ramos.append(pendentes(filtro_doacao).values(
+            tipo=Value('pendente', output_field=CharField()),
+            chave=F('id'),
+            data=F('data_criacao'),
+            categoria_nome=F('categoria__nome'),
+            local_nome=F('local_entrega__nome'),
+            doador_nome=F('doador__username'),
+            qtd=F('quantidade'),
+        ))
+    if status != 'pendente':
+        ramos.append(distribuicoes(filtro_distribuicao).values(
+            tipo=Value('distribuida', output_field=CharField()),
+            chave=F('id'),
+            data=F('data_distribuicao'),
+            categoria_nome=F('doacao__categoria__nome'),
+            local_nome=F('doacao__local_entrega__nome'),
+            doador_nome=F('doacao__doador__username'),
+            qtd=F('quantidade_distribuida'),
+        ))
+    consulta = ramos[0].union(*ramos[1:], all=True) if len(ramos) > 1 else ramos[0]
+    return consulta.order_by('-data', '-tipo', '-chave')
+
+
+def total(status, filtro_doacao, filtro_distribuicao):
+    soma = 0
+    if status != 'distribuida':
+        soma += pendentes(filtro_doacao).aggregate(t=Sum('quantidade'))['t'] or 0
+    if status != 'pendente':
+        soma += distribuicoes(filtro_distribuicao).aggregate(t=Sum('quantidade_distribuida'))['t'] or 0
+    return soma
+
+
+def montar_linhas(linhas, categorias, locais):
+    """
+    Resolve categoria, local e doador de cada linha usando os dicionários
+    já carregados e uma única consulta em lote para os doadores.
+    """
+    doadores = User.objects.only('id', 'username').in_bulk({l['doador_ref'] for l in linhas})
+    return [{
+        'categoria': categorias.get(l['cat_id']),
+        'quantidade': l['qtd'],
+        'status': l['tipo'],
+        'local_entrega': locais.get(l['local_id']),
+        'doador': doadores.get(l['doador_ref']),
+        'data': l['data'],
+    } for l in linhas]
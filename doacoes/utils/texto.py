@@ -0,0 +1,8 @@
+import unicodedata
+
+
+def normalizar_busca(valor):
+    """Minúsculas, sem acentos e com espaços simples, para busca por prefixo."""
+    decomposto = unicodedata.normalize('NFKD', valor or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
@@ -0,0 +1,17 @@
+from django.core.exceptions import ValidationError
+
+from . import documentos
+
+
+def limpar_cpf_cnpj(valor):
+    valor_numeros, erro = documentos.validar(valor)
+    if erro:
+        raise ValidationError(erro)
+    return valor_numeros
+
+
+def limpar_telefone(valor):
+    valor_numeros = documentos.somente_digitos(valor)
+    if len(valor_numeros) not in [10, 11]:
+        raise ValidationError('Telefone inválido. Informe com DDD (10 ou 11 dígitos).')
+    return valor_numeros
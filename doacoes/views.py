@@ -1,16 +1,60 @@
+import asyncio
+import csv
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import HttpResponseForbidden
-from django.db.models import Sum
-from .models import Categoria, Doacao, Recebedor, Distribuicao, LocalEntrega
-from .forms import FormCadastroUsuario, FormEditarUsuario, FormRecebedor, DistribuicaoMultiplaPorCategoriaForm, FormDoacoesMultiplas
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.utils import timezone
+from django.db.models import F, Sum
+from .models import Categoria, Doacao, Recebedor, LocalEntrega, Perfil, SaldoEstoque
+from .forms import FormCadastroUsuario, FormEditarUsuario, FormRecebedor, DistribuicaoMultiplaPorCategoriaForm, FormDoacoesMultiplas, FormImportacao
+from .utils import contadores, estoque, eventos, fila, historico, importacao, relatorio
+from .utils.busca import buscar_recebedores, filtro_prefixo
+from .utils.distribuicao import distribuir, EstoqueInsuficiente
+from .utils.paginacao import fatiar, paginar
+from .utils.recebimento import registrar_doacoes
+from .utils.texto import normalizar_busca
+
+ORDEM_USUARIOS = {
+    'usuario': ('username',),
+    '-usuario': ('-username',),
+    'recentes': ('-id',),
+    'antigos': ('id',),
+}
+
+ORDEM_NOME = {
+    'nome': ('nome', 'id'),
+    '-nome': ('-nome', '-id'),
+    'recentes': ('-id',),
+}
+
+ORDEM_RECEBEDORES = {
+    'nome': ('nome_busca', 'id'),
+    '-nome': ('-nome_busca', '-id'),
+    'recentes': ('-id',),
+}
 
 def is_admin(user):
     return user.is_authenticated and hasattr(user, 'perfil') and user.perfil.tipo == 'administrador'
 
+def is_equipe(user):
+    return user.is_authenticated and hasattr(user, 'perfil') and user.perfil.tipo in ('voluntario', 'administrador')
+
+def _em_asgi(request):
+    return isinstance(request, ASGIRequest)
+
 def registrar_usuario(request):
     if request.method == 'POST':
         form = FormCadastroUsuario(request.POST)
@@ -134,8 +178,26 @@ def cadastrar_usuario(request):
 @login_required
 @user_passes_test(is_admin)
 def gerenciar_usuarios(request):
-    usuarios = User.objects.select_related('perfil').all()
-    return render(request, 'doacoes/admin/gerenciar_usuarios.html', {'usuarios': usuarios})
+    usuarios = User.objects.select_related('perfil')
+    tipo = request.GET.get('tipo', '')
+    ativo = request.GET.get('ativo', '')
+    nome = request.GET.get('nome', '').strip()
+    if tipo:
+        usuarios = usuarios.filter(perfil__tipo=tipo)
+    if ativo in ('1', '0'):
+        usuarios = usuarios.filter(is_active=ativo == '1')
+    if nome:
+        usuarios = usuarios.filter(**filtro_prefixo('username', nome))
+    pagina, ordem = paginar(request.GET, usuarios, ORDEM_USUARIOS)
+    return render(request, 'doacoes/admin/gerenciar_usuarios.html', {
+        'usuarios': pagina,
+        'pagina': pagina,
+        'ordem': ordem,
+        'tipo': tipo,
+        'ativo': ativo,
+        'nome': nome,
+        'tipos': Perfil.TIPO_CHOICES,
+    })
 
 @login_required
 @user_passes_test(is_admin)
@@ -179,11 +241,22 @@ def home_doador(request):
     return render(request, 'doacoes/home_doador.html')
 
 @login_required
-def minhas_doacoes(request):
-    if request.user.perfil.tipo != 'doador':
+async def minhas_doacoes(request):
+    usuario = await request.auser()
+    if usuario.perfil.tipo != 'doador':
         return HttpResponseForbidden()
-    doacoes = Doacao.objects.filter(doador=request.user)
-    return render(request, 'doacoes/minhas_doacoes.html', {'doacoes': doacoes})
+    cursor = request.GET.get('cursor')
+    totais = [t async for t in historico.totais_do_doador(usuario)]
+    doacoes, proximo_cursor = fatiar(
+        [d async for d in historico.doacoes_do_doador(usuario, cursor)],
+        historico.TAMANHO_PAGINA, 'data_criacao'
+    )
+    return render(request, 'doacoes/minhas_doacoes.html', {
+        'doacoes': doacoes,
+        'totais': totais,
+        'proximo_cursor': proximo_cursor,
+        'pagina_inicial': not cursor,
+    })
 
 @login_required
 def fazer_doacoes_multiplas(request):
@@ -195,19 +268,12 @@ def fazer_doacoes_multiplas(request):
     if request.method == 'POST':
         form = FormDoacoesMultiplas(request.POST, categorias=categorias)
         if form.is_valid():
-            local = form.cleaned_data['local_entrega']
-            desc_geral = form.cleaned_data.get('descricao', '')
-
-            for cat in categorias:
-                qtd = form.cleaned_data.get(f'quantidade_{cat.id}')
-                if qtd and qtd > 0:
-                    Doacao.objects.create(
-                        categoria=cat,
-                        quantidade=qtd,
-                        local_entrega=local,
-                        descricao=desc_geral or f"Doação de {qtd} {cat.nome.lower()}",
-                        doador=request.user
-                    )
+            registrar_doacoes(
+                request.user,
+                form.cleaned_data['local_entrega'],
+                {cat: form.cleaned_data.get(f'quantidade_{cat.id}') for cat in categorias},
+                form.cleaned_data.get('descricao', '')
+            )
             messages.success(request, "Doações registradas com sucesso.")
             return redirect('minhas_doacoes')
     else:
@@ -221,21 +287,84 @@ def fazer_doacoes_multiplas(request):
 
 # VOLUNTÁRIO
 @login_required
+@user_passes_test(is_equipe)
 def home_voluntario(request):
-    doacoes = Doacao.objects.filter(status='pendente')
-    return render(request, 'doacoes/home_voluntario.html', {'doacoes': doacoes})
+    cursor = request.GET.get('cursor')
+    doacoes, proximo_cursor = fila.pagina(cursor)
+    return render(request, 'doacoes/home_voluntario.html', {
+        'doacoes': doacoes,
+        'pendentes_por_categoria': fila.pendentes_por_categoria(),
+        'proximo_cursor': proximo_cursor,
+        'pagina_inicial': not cursor,
+    })
+
+def _versao_estoque(request):
+    # Lida uma vez por requisição: ETag, Last-Modified e a chave do fragmento
+    # precisam vir da mesma versão, e cada leitura é uma ida ao cache.
+    if not hasattr(request, '_versao_estoque'):
+        request._versao_estoque = estoque.versao()
+    return request._versao_estoque
+
+def _etag_estoque(request):
+    return str(_versao_estoque(request))
+
+def _estoque_modificado_em(request):
+    return datetime.fromtimestamp(_versao_estoque(request) / 1e9, tz=dt_timezone.utc)
 
 @login_required
-def listar_doacoes(request):
-    doacoes_agrupadas = (
-        Doacao.objects
-        .filter(status='pendente')  
-        .values('categoria__nome', 'local_entrega__nome')
-        .annotate(total_quantidade=Sum('quantidade'))
-        .order_by('categoria__nome')
-    )
-    context = {'doacoes_agrupadas': doacoes_agrupadas}
-    return render(request, 'doacoes/lista_doacoes.html', context)
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_etag_estoque, last_modified_func=_estoque_modificado_em)
+async def listar_doacoes(request):
+    # A versão é lida antes da consulta: uma mudança concorrente gera outra
+    # versão, então o fragmento guardado nunca fica mais velho que a chave.
+    chave = f'{estoque.CHAVE_VERSAO}:{_versao_estoque(request)}:agrupado'
+    tabela = await cache.aget(chave)
+    if tabela is None:
+        doacoes_agrupadas = [
+            item async for item in
+            SaldoEstoque.objects
+            .filter(quantidade__gt=0)
+            .values('categoria_id', 'local_entrega_id', 'categoria__nome', 'local_entrega__nome',
+                    total_quantidade=F('quantidade'))
+            .order_by('categoria__nome')
+        ]
+        tabela = render_to_string('doacoes/_estoque_agrupado.html', {'doacoes_agrupadas': doacoes_agrupadas})
+        await cache.aset(chave, tabela, settings.CACHE_ESTOQUE_TIMEOUT)
+    return render(request, 'doacoes/lista_doacoes.html', {
+        'tabela_estoque': tabela,
+        'eventos_ativos': _em_asgi(request),
+    })
+
+INTERVALO_PING = 25
+
+@login_required
+async def eventos_estoque(request):
+    """
+    Server-Sent Events com os novos saldos ({categoria, local_entrega, saldo})
+    a cada movimento de estoque confirmado. Só no modo ASGI, em que a conexão
+    aberta não prende uma thread: no WSGI o fluxo sem fim seria lido inteiro
+    antes do envio e seguraria o worker para sempre, então a resposta é 204,
+    que também faz o EventSource desistir de reconectar.
+    """
+    if not _em_asgi(request):
+        return HttpResponse(status=204)
+
+    async def fluxo():
+        with eventos.broker().assinar() as assinatura:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    evento = await assinatura.proximo(timeout=INTERVALO_PING)
+                except asyncio.TimeoutError:
+                    # Comentário SSE para proxies não fecharem a conexão ociosa.
+                    yield ': ping\n\n'
+                    continue
+                yield f'event: saldo\ndata: {json.dumps(evento)}\n\n'
+
+    resposta = StreamingHttpResponse(fluxo(), content_type='text/event-stream')
+    resposta['Cache-Control'] = 'no-cache'
+    resposta['X-Accel-Buffering'] = 'no'
+    return resposta
 
 @login_required
 def cadastrar_recebedor(request):
@@ -248,36 +377,28 @@ def cadastrar_recebedor(request):
         form = FormRecebedor()
     return render(request, 'doacoes/form_recebedor.html', {'form': form})
 
+@login_required
+@user_passes_test(is_equipe)
+def buscar_recebedores_json(request):
+    return JsonResponse({'resultados': buscar_recebedores(request.GET.get('q', ''))})
+
 @login_required
 def distribuir_por_categoria(request):
-    from django.db.models import Sum
-    categorias = Categoria.objects.annotate(disponivel=Sum('doacao__quantidade')).filter(disponivel__gt=0)
+    categorias = Categoria.objects.annotate(disponivel=Sum('saldos__quantidade')).filter(disponivel__gt=0)
 
     if request.method == 'POST':
         form = DistribuicaoMultiplaPorCategoriaForm(request.POST, categorias=categorias)
         if form.is_valid():
             recebedor = form.cleaned_data['recebedor']
-            for cat in categorias:
-                quantidade = form.cleaned_data.get(f'quantidade_{cat.id}') or 0
-                if quantidade > 0:
-                    doacoes = Doacao.objects.filter(categoria=cat, status='pendente').order_by('data_criacao')
-                    restante = quantidade
-                    for d in doacoes:
-                        if d.quantidade <= 0:
-                            continue
-                        usar = min(restante, d.quantidade)
-                        Distribuicao.objects.create(
-                            doacao=d,
-                            recebedor=recebedor,
-                            quantidade_distribuida=usar
-                        )
-                        d.quantidade -= usar
-                        if d.quantidade == 0:
-                            d.status = 'distribuida'
-                        d.save()
-                        restante -= usar
-                        if restante <= 0:
-                            break
+            quantidades = {
+                cat.id: form.cleaned_data.get(f'quantidade_{cat.id}') or 0
+                for cat in categorias
+            }
+            try:
+                distribuir(recebedor, quantidades)
+            except EstoqueInsuficiente:
+                messages.error(request, "Estoque insuficiente para a distribuição solicitada.")
+                return redirect('distribuir_por_categoria')
             messages.success(request, "Distribuição por categoria realizada com sucesso.")
             return redirect('home_voluntario')
     else:
@@ -288,22 +409,96 @@ def distribuir_por_categoria(request):
         'categorias': categorias
     })
 
+def _pagina_distribuicoes(request, consulta):
+    cursor = request.GET.get('cursor')
+    distribuicoes, proximo_cursor = fatiar(
+        list(consulta(cursor)), historico.TAMANHO_PAGINA, 'data_distribuicao'
+    )
+    return {
+        'distribuicoes': distribuicoes,
+        'proximo_cursor': proximo_cursor,
+        'pagina_inicial': not cursor,
+    }
+
+def _distribuicoes_json(pagina):
+    return JsonResponse({
+        'resultados': [historico.distribuicao_como_dict(d) for d in pagina['distribuicoes']],
+        'proximo_cursor': pagina['proximo_cursor'],
+    })
+
+@login_required
+@user_passes_test(is_equipe)
+def historico_recebedor(request, recebedor_id):
+    recebedor = get_object_or_404(Recebedor, id=recebedor_id)
+    pagina = _pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_do_recebedor(recebedor.id, cursor)
+    )
+    return render(request, 'doacoes/historico_recebedor.html', {'recebedor': recebedor, **pagina})
+
+@login_required
+@user_passes_test(is_equipe)
+def historico_recebedor_json(request, recebedor_id):
+    recebedor = get_object_or_404(Recebedor, id=recebedor_id)
+    return _distribuicoes_json(_pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_do_recebedor(recebedor.id, cursor)
+    ))
+
+@login_required
+@user_passes_test(is_equipe)
+def rastrear_doacao(request, doacao_id):
+    doacao = get_object_or_404(
+        Doacao.objects.select_related('categoria', 'local_entrega', 'doador'), id=doacao_id
+    )
+    pagina = _pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_da_doacao(doacao.id, cursor)
+    )
+    return render(request, 'doacoes/rastreio_doacao.html', {'doacao': doacao, **pagina})
+
+@login_required
+@user_passes_test(is_equipe)
+def rastrear_doacao_json(request, doacao_id):
+    doacao = get_object_or_404(Doacao, id=doacao_id)
+    return _distribuicoes_json(_pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_da_doacao(doacao.id, cursor)
+    ))
+
+@login_required
+@user_passes_test(is_equipe)
+def rastrear_doador(request, doador_id):
+    doador = get_object_or_404(User, id=doador_id)
+    pagina = _pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_do_doador(doador.id, cursor)
+    )
+    return render(request, 'doacoes/rastreio_doador.html', {'doador': doador, **pagina})
+
+@login_required
+@user_passes_test(is_equipe)
+def rastrear_doador_json(request, doador_id):
+    doador = get_object_or_404(User, id=doador_id)
+    return _distribuicoes_json(_pagina_distribuicoes(
+        request, lambda cursor: historico.distribuicoes_do_doador(doador.id, cursor)
+    ))
+
 # PAINEL ADMINISTRADOR
 @login_required
 @user_passes_test(is_admin)
-def admin_dashboard(request):
+async def admin_dashboard(request):
+    contexto = await contadores.aobter()
     return render(request, 'doacoes/admin/dashboard.html', {
-        'num_users': User.objects.count(),
-        'num_categories': Categoria.objects.count(),
-        'num_recebedores': Recebedor.objects.count(),
-        'num_locais_entrega': LocalEntrega.objects.count(),
+        **contexto, 'usuario': await request.auser()
     })
 
 @login_required
 @user_passes_test(is_admin)
 def admin_gerenciar_categorias(request):
     categorias = Categoria.objects.all()
-    return render(request, 'doacoes/admin/gerenciar_categorias.html', {'categorias': categorias})
+    nome = request.GET.get('nome', '').strip()
+    if nome:
+        categorias = categorias.filter(**filtro_prefixo('nome', nome))
+    pagina, ordem = paginar(request.GET, categorias, ORDEM_NOME)
+    return render(request, 'doacoes/admin/gerenciar_categorias.html', {
+        'categorias': pagina, 'pagina': pagina, 'ordem': ordem, 'nome': nome,
+    })
 
 @login_required
 @user_passes_test(is_admin)
@@ -339,7 +534,13 @@ def admin_excluir_categoria(request, categoria_id):
 @user_passes_test(is_admin)
 def admin_gerenciar_locais_entrega(request):
     locais = LocalEntrega.objects.all()
-    return render(request, 'doacoes/admin/gerenciar_locais_entrega.html', {'locais': locais})
+    nome = request.GET.get('nome', '').strip()
+    if nome:
+        locais = locais.filter(**filtro_prefixo('nome', nome))
+    pagina, ordem = paginar(request.GET, locais, ORDEM_NOME)
+    return render(request, 'doacoes/admin/gerenciar_locais_entrega.html', {
+        'locais': pagina, 'pagina': pagina, 'ordem': ordem, 'nome': nome,
+    })
 
 @login_required
 @user_passes_test(is_admin)
@@ -374,7 +575,13 @@ def admin_excluir_local_entrega(request, local_id):
 @user_passes_test(is_admin)
 def admin_gerenciar_recebedores(request):
     recebedores = Recebedor.objects.all()
-    return render(request, 'doacoes/admin/gerenciar_recebedores.html', {'recebedores': recebedores})
+    nome = request.GET.get('nome', '').strip()
+    if nome:
+        recebedores = recebedores.filter(**filtro_prefixo('nome_busca', normalizar_busca(nome)))
+    pagina, ordem = paginar(request.GET, recebedores, ORDEM_RECEBEDORES)
+    return render(request, 'doacoes/admin/gerenciar_recebedores.html', {
+        'recebedores': pagina, 'pagina': pagina, 'ordem': ordem, 'nome': nome,
+    })
 
 @login_required
 @user_passes_test(is_admin)
@@ -409,67 +616,109 @@ def admin_excluir_recebedor(request, recebedor_id):
 
 @login_required
 @user_passes_test(is_admin)
-def admin_relatorio_doacoes(request):
-    cid = request.GET.get('categoria')
-    status = request.GET.get('status')
-    lid = request.GET.get('local_entrega')
-
-    categorias = Categoria.objects.all()
-    locais = LocalEntrega.objects.all()
-
-    filtro_doacao = {}
-    filtro_distribuicao = {}
-
-    if cid:
-        filtro_doacao['categoria_id'] = cid
-        filtro_distribuicao['doacao__categoria_id'] = cid
-
-    if lid:
-        filtro_doacao['local_entrega_id'] = lid
-        filtro_distribuicao['doacao__local_entrega_id'] = lid
-
-    doacoes = []
-    total = 0
-
-    if status == "pendente":
-        doacoes = Doacao.objects.filter(status="pendente", **filtro_doacao)
-        total = doacoes.aggregate(Sum('quantidade'))['quantidade__sum'] or 0
+def admin_importar_dados(request):
+    resultado = None
+    if request.method == 'POST':
+        form = FormImportacao(request.POST, request.FILES)
+        if form.is_valid():
+            arquivo = form.cleaned_data['arquivo']
+            try:
+                resultado = importacao.importar(
+                    form.cleaned_data['tipo'],
+                    arquivo,
+                    importacao.formato_do_arquivo(arquivo.name)
+                )
+            except ValueError:
+                form.add_error('arquivo', 'Não foi possível ler o arquivo.')
+    else:
+        form = FormImportacao()
+    return render(request, 'doacoes/admin/importar.html', {
+        'form': form,
+        'resultado': resultado,
+        'rejeitados': resultado.rejeitados[:200] if resultado else [],
+    })
 
-    elif status == "distribuida":
-        distribuicoes = Distribuicao.objects.filter(**filtro_distribuicao).select_related('doacao__categoria', 'doacao__doador')
-        doacoes = [{
-            'categoria': d.doacao.categoria,
-            'quantidade': d.quantidade_distribuida,
-            'status': "distribuida",
-            'local_entrega': d.doacao.local_entrega,
-            'doador': d.doacao.doador
-        } for d in distribuicoes]
-        total = sum(d['quantidade'] for d in doacoes)
+def _contexto_relatorio(params):
+    cid = params.get('categoria')
+    status = params.get('status')
+    lid = params.get('local_entrega')
 
-    else:
-        doacoes_pendentes = Doacao.objects.filter(status="pendente", **filtro_doacao)
-        distribuicoes = Distribuicao.objects.filter(**filtro_distribuicao).select_related('doacao__categoria', 'doacao__doador')
+    categorias = list(Categoria.objects.all())
+    locais = list(LocalEntrega.objects.all())
 
-        distribuicoes_formatadas = [{
-            'categoria': d.doacao.categoria,
-            'quantidade': d.quantidade_distribuida,
-            'status': "distribuida",
-            'local_entrega': d.doacao.local_entrega,
-            'doador': d.doacao.doador
-        } for d in distribuicoes]
+    filtro_doacao, filtro_distribuicao = relatorio.filtros(params)
 
-        doacoes = list(doacoes_pendentes) + distribuicoes_formatadas
+    linhas, proximo_cursor = relatorio.pagina(
+        status, filtro_doacao, filtro_distribuicao, cursor=params.get('cursor')
+    )
+    doacoes = relatorio.montar_linhas(
+        linhas,
+        {c.id: c for c in categorias},
+        {l.id: l for l in locais}
+    )
+    total = relatorio.total(status, filtro_doacao, filtro_distribuicao)
 
-        total_pendentes = doacoes_pendentes.aggregate(Sum('quantidade'))['quantidade__sum'] or 0
-        total_distribuidas = sum(d['quantidade'] for d in distribuicoes_formatadas)
-        total = total_pendentes + total_distribuidas
+    parametros = params.copy()
+    parametros.pop('cursor', None)
 
-    return render(request, 'doacoes/admin/relatorio_admin.html', {
+    return {
         'doacoes': doacoes,
         'categorias': categorias,
         'cid': cid,
         'status': status,
         'total': total,
         'locais': locais,
-        'lid': lid         
-    })
+        'lid': lid,
+        'filtros_url': parametros.urlencode(),
+        'proximo_cursor': proximo_cursor,
+        'pagina_inicial': not params.get('cursor'),
+    }
+
+@login_required
+@user_passes_test(is_admin)
+async def admin_relatorio_doacoes(request):
+    # As consultas do relatório rodam juntas numa única ida à thread do banco.
+    contexto = await sync_to_async(_contexto_relatorio)(request.GET)
+    return render(request, 'doacoes/admin/relatorio_admin.html', contexto)
+
+class _Eco:
+    def write(self, valor):
+        return valor
+
+CABECALHO_EXPORTACAO = ['Data', 'Categoria', 'Quantidade', 'Status', 'Local', 'Doador']
+
+def _linha_exportacao(escritor, l):
+    return escritor.writerow([
+        timezone.localtime(l['data']).strftime('%d/%m/%Y %H:%M'),
+        l['categoria_nome'],
+        l['qtd'],
+        l['tipo'],
+        l['local_nome'],
+        l['doador_nome'],
+    ])
+
+@login_required
+@user_passes_test(is_admin)
+def admin_exportar_relatorio(request):
+    status = request.GET.get('status')
+    filtro_doacao, filtro_distribuicao = relatorio.filtros(request.GET)
+    linhas = relatorio.linhas_exportacao(status, filtro_doacao, filtro_distribuicao)
+    escritor = csv.writer(_Eco())
+
+    def gerar():
+        yield '\ufeff' + escritor.writerow(CABECALHO_EXPORTACAO)
+        for l in linhas.iterator(chunk_size=2000):
+            yield _linha_exportacao(escritor, l)
+
+    # No ASGI um iterador síncrono é lido inteiro antes do envio; o
+    # assíncrono mantém a memória constante como o gerar() no WSGI.
+    async def agerar():
+        yield '\ufeff' + escritor.writerow(CABECALHO_EXPORTACAO)
+        async for l in linhas.aiterator(chunk_size=2000):
+            yield _linha_exportacao(escritor, l)
+
+    resposta = StreamingHttpResponse(
+        agerar() if _em_asgi(request) else gerar(), content_type='text/csv; charset=utf-8'
+    )
+    resposta['Content-Disposition'] = 'attachment; filename="relatorio_doacoes.csv"'
+    return resposta
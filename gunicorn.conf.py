@@ -0,0 +1,82 @@
+"""
+Configuração do gunicorn para produção, toda lida de variáveis de ambiente:
+
+    SERVIDOR          'wsgi' (padrão, workers gthread) ou 'asgi' (workers uvicorn)
+    PORT              porta de escuta (padrão 8000)
+    WEB_CONCURRENCY   número de workers (padrão 2 x CPUs + 1; 1 no modo asgi
+                      com o EVENTOS_BROKER local, que não passa eventos
+                      entre processos)
+    GUNICORN_THREADS  threads por worker no modo wsgi (padrão 2)
+    GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE
+    GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER
+
+Teste de carga, comparando a linha de comando antiga com esta configuração
+sobre o mesmo banco (o Host precisa estar em ALLOWED_HOSTS):
+
+    gunicorn ajudefacil.wsgi -b 127.0.0.1:8000
+    PORT=8001 gunicorn -c gunicorn.conf.py
+    python manage.py carga antes=http://127.0.0.1:8000 depois=http://127.0.0.1:8001 \\
+        --host ajudefacil.onrender.com --concorrencia 50 --saida carga.json
+
+O resultado depende do número de CPUs e do banco; registre o JSON gerado
+junto com a máquina usada em vez de copiar números de outro ambiente.
+"""
+import os
+
+
+def _inteiro(nome, padrao):
+    valor = os.environ.get(nome)
+    return int(valor) if valor else padrao
+
+
+def _cpus():
+    # Em contêineres, sched_getaffinity reflete as CPUs de fato disponíveis.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+ASGI = os.environ.get('SERVIDOR', 'wsgi') == 'asgi'
+
+wsgi_app = 'ajudefacil.asgi:application' if ASGI else 'ajudefacil.wsgi:application'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# BrokerLocal só entrega eventos de estoque a assinantes do mesmo processo:
+# com vários workers, o fluxo SSE de um voluntário perderia as mudanças
+# gravadas pelos outros.
+BROKER_LOCAL = os.environ.get(
+    'EVENTOS_BROKER', 'doacoes.utils.eventos.BrokerLocal'
+) == 'doacoes.utils.eventos.BrokerLocal'
+
+workers = _inteiro('WEB_CONCURRENCY', 1 if ASGI and BROKER_LOCAL else 2 * _cpus() + 1)
+threads = _inteiro('GUNICORN_THREADS', 2)
+worker_class = 'uvicorn_worker.UvicornWorker' if ASGI else 'gthread'
+
+# Carrega o Django uma vez no processo mestre; os workers nascem prontos.
+preload_app = True
+
+timeout = _inteiro('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _inteiro('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _inteiro('GUNICORN_KEEPALIVE', 5)
+
+# Recicla workers periodicamente, com jitter para não reiniciarem todos juntos.
+max_requests = _inteiro('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _inteiro('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+accesslog = '-'
+
+
+def when_ready(server):
+    if ASGI and BROKER_LOCAL and workers > 1:
+        server.log.warning(
+            "SERVIDOR=asgi com %s workers e EVENTOS_BROKER local: os fluxos de "
+            "eventos de estoque só recebem as mudanças do próprio worker.", workers
+        )
+
+
+def post_fork(server, worker):
+    # Com preload_app, uma conexão aberta no mestre seria herdada e
+    # compartilhada por todos os workers; cada um abre a sua.
+    from django.db import connections
+    connections.close_all()